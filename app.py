@@ -1,15 +1,19 @@
-from flask import Flask, flash, render_template, url_for
+from flask import Flask, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from flask_cors import CORS
 from config import Config
-from models import db, User, ServiceCategory, AdminProfile
+from models import db, User, ServiceCategory, AdminProfile, ArtisanProfile
+from db_utils import UUIDStringConverter, init_query_budget
+from responses import OrjsonProvider, dumps_text
+import orjson
 import os
 from datetime import datetime, timedelta, timezone
 from dateutil import tz
 from dotenv import load_dotenv
 from extension import app
 import tempfile
+from urllib.parse import urlparse
 from config import config
 
 
@@ -105,6 +109,22 @@ def create_app(config_class):
     # Load configuration FIRST
     app.config.from_object(config_class)
     
+    # psycopg2: batch executemany for UPDATE/DELETE too, not just INSERT
+    database_uri = app.config.get('SQLALCHEMY_DATABASE_URI')
+    if isinstance(database_uri, str) and database_uri.startswith('postgresql'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+            'executemany_mode': 'values_plus_batch'
+        }
+    
+    # JSON columns and jsonify() encode with orjson
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+        'json_serializer': dumps_text,
+        'json_deserializer': orjson.loads
+    }
+    app.json = OrjsonProvider(app)
+    
     # File upload configuration
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
     
@@ -135,6 +155,7 @@ def create_app(config_class):
     
     # Initialize extensions
     db.init_app(app)
+    init_query_budget(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
     CORS(app)
@@ -146,19 +167,23 @@ def create_app(config_class):
     # Add context processor for helper functions
     @app.context_processor
     def utility_processor():
+        def _category_artisans(category_name):
+            return db.session.query(ArtisanProfile).join(ArtisanProfile.user)\
+                .join(ArtisanProfile.service_category)\
+                .filter(ServiceCategory.name == category_name,
+                        User.is_active == True,
+                        User.is_verified == True)
+        
         def get_artisan_count(category_name):
             """Get count of artisans in a category"""
-            from models import Artisan
-            return Artisan.query.filter_by(category=category_name, is_active=True, is_verified=True).count()
+            return _category_artisans(category_name).count()
         
         def get_average_rating(category_name):
             """Get average rating for a category"""
-            from models import Artisan
-            artisans = Artisan.query.filter_by(category=category_name, is_active=True, is_verified=True).all()
-            if not artisans:
+            avg = _category_artisans(category_name)\
+                .with_entities(db.func.avg(db.func.coalesce(ArtisanProfile.rating, 0))).scalar()
+            if avg is None:
                 return 4.5  # Default rating
-            total_rating = sum(artisan.rating or 0 for artisan in artisans)
-            avg = total_rating / len(artisans)
             return round(avg, 1)
         
         return dict(get_artisan_count=get_artisan_count, get_average_rating=get_average_rating)
@@ -181,6 +206,20 @@ def create_app(config_class):
         
         return dict(get_notification_link=get_notification_link)
 
+    # Uploads over MAX_CONTENT_LENGTH are refused before the body is buffered
+    @app.errorhandler(413)
+    def request_entity_too_large(error):
+        limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+        message = f'Upload too large (max {limit_mb}MB)'
+        if request.is_json:
+            return jsonify({'error': message}), 413
+        flash(message, 'danger')
+        # Only bounce back to a page on this site; the Referer header is client-controlled
+        referrer = urlparse(request.referrer or '')
+        if referrer.scheme in ('http', 'https') and referrer.netloc == request.host:
+            return redirect(request.referrer)
+        return redirect(url_for('index'))
+    
     # Custom Jinja2 filters
     @app.template_filter('nl2br')
     def nl2br_filter(text):
@@ -285,6 +324,9 @@ def create_app(config_class):
             
         return None
     
+    # Id segments in routes are validated by the converter (must exist before rules are added)
+    app.url_map.converters['uuid_str'] = UUIDStringConverter
+    
     # Register blueprints
     from routes.user_routes import user_bp
     from routes.admin_routes import admin_bp
@@ -0,0 +1,149 @@
+import orjson
+from cachetools import TTLCache
+from flask import current_app
+
+try:
+    import redis
+except ImportError:  # Caching is optional - without redis every lookup is a miss
+    redis = None
+
+_client = None
+
+def get_client():
+    """Lazily build the Redis client from REDIS_URL; None when caching is unavailable"""
+    global _client
+    if _client is None and redis is not None:
+        url = current_app.config.get('REDIS_URL')
+        if url:
+            _client = redis.Redis.from_url(url, decode_responses=True)
+    return _client
+
+def get_text(key):
+    client = get_client()
+    if client is None:
+        return None
+    try:
+        return client.get(key)
+    except redis.RedisError:
+        return None
+
+def set_text(key, value, ttl):
+    client = get_client()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, value)
+    except redis.RedisError:
+        pass
+
+def get_field(key, field):
+    client = get_client()
+    if client is None:
+        return None
+    try:
+        return client.hget(key, field)
+    except redis.RedisError:
+        return None
+
+def set_field(key, field, value, ttl):
+    """Store one field of a hash; the TTL applies to the whole hash"""
+    client = get_client()
+    if client is None:
+        return
+    try:
+        client.pipeline().hset(key, field, value).expire(key, ttl).execute()
+    except redis.RedisError:
+        pass
+
+def get_json(key):
+    value = get_text(key)
+    return orjson.loads(value) if value else None
+
+def set_json(key, value, ttl):
+    set_text(key, orjson.dumps(value).decode(), ttl)
+
+def delete(*keys):
+    client = get_client()
+    if client is None:
+        return
+    try:
+        client.delete(*keys)
+    except redis.RedisError:
+        pass
+
+# Service categories change rarely and are read on most pages
+CATEGORIES_KEY = 'svc:categories:v1'
+CATEGORY_NAMES_KEY = 'svc:category_names:v1'
+CATEGORIES_TTL = 3600  # seconds
+ACTIVE_CATEGORIES_KEY = 'v1:service_categories:active'
+ACTIVE_CATEGORIES_TTL = 86400  # seconds
+
+# Per-process tier in front of Redis for the public category payload. Invalidation
+# only clears this worker's copy, so other workers may serve it for up to L1_TTL.
+L1_TTL = 60  # seconds
+_local = TTLCache(maxsize=16, ttl=L1_TTL)
+
+def get_categories():
+    """All service categories as dicts, served from cache when possible"""
+    categories = get_json(CATEGORIES_KEY)
+    if categories is None:
+        from models import ServiceCategory
+        categories = [cat.to_dict() for cat in ServiceCategory.query.order_by(ServiceCategory.name).all()]
+        set_json(CATEGORIES_KEY, categories, CATEGORIES_TTL)
+    return categories
+
+def category_names():
+    """id -> name map for decorating request rows without joining categories"""
+    names = get_json(CATEGORY_NAMES_KEY)
+    if names is None:
+        names = {cat['id']: cat['name'] for cat in get_categories()}
+        set_json(CATEGORY_NAMES_KEY, names, CATEGORIES_TTL)
+    return names
+
+def active_categories_payload():
+    """Encoded {"categories": [...]} body for the public category endpoint"""
+    payload = _local.get(ACTIVE_CATEGORIES_KEY)
+    if payload is not None:
+        return payload
+    payload = get_text(ACTIVE_CATEGORIES_KEY)
+    if payload is None:
+        from models import ServiceCategory
+        categories = ServiceCategory.query.filter_by(is_active=True).all()
+        payload = orjson.dumps({'categories': [cat.to_dict() for cat in categories]}).decode()
+        set_text(ACTIVE_CATEGORIES_KEY, payload, ACTIVE_CATEGORIES_TTL)
+    _local[ACTIVE_CATEGORIES_KEY] = payload
+    return payload
+
+def active_categories():
+    """Active categories as dicts for dropdowns, held decoded in-process for L1_TTL"""
+    categories = _local.get('active_category_list')
+    if categories is None:
+        categories = orjson.loads(active_categories_payload())['categories']
+        _local['active_category_list'] = categories
+    return categories
+
+def invalidate_categories():
+    _local.clear()
+    delete(CATEGORIES_KEY, CATEGORY_NAMES_KEY, ACTIVE_CATEGORIES_KEY)
+
+# Notification feeds: one hash per user, one field per filter/page variant, so a
+# single DEL drops every cached page when the user's notifications change
+NOTIFICATIONS_TTL = 300  # seconds
+
+def notifications_key(user_id):
+    return f'notif:user:{user_id}'
+
+def invalidate_notifications(*user_ids):
+    if user_ids:
+        delete(*(notifications_key(user_id) for user_id in user_ids))
+
+# Artisan dashboard counters only move when one of the artisan's jobs changes status
+ARTISAN_DASHBOARD_TTL = 60  # seconds
+
+def artisan_dashboard_key(artisan_id):
+    return f'artisan:{artisan_id}:dash'
+
+def invalidate_artisan_dashboard(*artisan_ids):
+    artisan_ids = [artisan_id for artisan_id in artisan_ids if artisan_id]
+    if artisan_ids:
+        delete(*(artisan_dashboard_key(artisan_id) for artisan_id in artisan_ids))
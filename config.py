@@ -6,12 +6,17 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///artisan_platform.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        # Rows per batched INSERT when executemany goes through insertmanyvalues
+        'insertmanyvalues_page_size': 1000
+    }
     
     # Security
     SESSION_COOKIE_SECURE = True
     REMEMBER_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
     REMEMBER_COOKIE_HTTPONLY = True
+    PASSWORD_HASH_METHOD = 'scrypt'
     
     # File upload
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
@@ -45,6 +50,19 @@ class Config:
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
     CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET')
     
+    # Serve uploaded portfolio files from the front-end proxy, e.g. '/protected/portfolio'
+    # with nginx: location /protected/portfolio/ { internal; alias <UPLOAD_FOLDER>/portfolio/; }
+    PORTFOLIO_ACCEL_REDIRECT = os.environ.get('PORTFOLIO_ACCEL_REDIRECT')
+    
+    # Redis cache (optional - unset disables caching)
+    REDIS_URL = os.environ.get('REDIS_URL')
+    
+    # RQ queue for notification fan-out and Cloudinary deletes (optional - unset runs them inline).
+    # Only set this where a worker runs alongside the app, e.g.
+    #   rq worker notifications --url $NOTIFICATION_QUEUE_URL
+    # The Vercel deployment runs no worker, so leave it unset there.
+    NOTIFICATION_QUEUE_URL = os.environ.get('NOTIFICATION_QUEUE_URL')
+    
     # Session configuration
     SESSION_TYPE = 'filesystem'
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
@@ -57,11 +75,33 @@ class DevelopmentConfig(Config):
     # Use local SQLite database in development
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URL', 'sqlite:///dev.db')
 
+class TestingConfig(Config):
+    """Testing configuration"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite:///:memory:')
+    
+    # Single-iteration hashing keeps user fixtures cheap; never use outside tests
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1'
+    
+    # Un-eager-loaded relationships on list queries raise instead of going N+1
+    RAISE_ON_LAZY_LOAD = True
+    # Log any request that issues more statements than this
+    QUERY_BUDGET = 10
+
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     FLASK_ENV = 'production'
     
+    # Size the pool to the worker's concurrency so requests don't queue for a connection
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': True,  # drop connections the server closed while idle
+        'pool_recycle': 1800  # seconds
+    }
+    
     # Ensure DATABASE_URL is set in production
     @classmethod
     def init_app(cls, app):
@@ -83,6 +123,14 @@ class ServerlessConfig(ProductionConfig):
     # Use temp directory for uploads
     UPLOAD_FOLDER = '/tmp/uploads'
     
+    # Each instance serves one request at a time and many instances run at once,
+    # so a production-sized pool per instance would exhaust the database's connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 1)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 1))
+    }
+    
     # Ensure we use PostgreSQL in production (serverless)
     @property
     def SQLALCHEMY_DATABASE_URI(self):
@@ -99,6 +147,7 @@ class ServerlessConfig(ProductionConfig):
 # Configuration dictionary
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
     'production': ProductionConfig,
     'serverless': ServerlessConfig,
     'default': ProductionConfig
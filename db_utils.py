@@ -0,0 +1,80 @@
+import uuid
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import raiseload
+from werkzeug.routing import UUIDConverter
+from models import db
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    # Registered once per process; only counts inside requests of apps with a budget
+    if has_request_context() and current_app.config.get('QUERY_BUDGET'):
+        g.query_count = g.get('query_count', 0) + 1
+
+def init_query_budget(app):
+    """Count statements per request and warn when a view exceeds QUERY_BUDGET.
+
+    Enabled by TestingConfig: a route that suddenly needs many more queries usually
+    grew an N+1 lazy load. The count is also sent back as X-Query-Count, which
+    tests/test_query_counts.py asserts on.
+    """
+    budget = app.config.get('QUERY_BUDGET')
+    if not budget:
+        return
+
+    @app.after_request
+    def report_query_count(response):
+        count = g.get('query_count', 0)
+        response.headers['X-Query-Count'] = str(count)
+        if count > budget:
+            app.logger.warning('%s %s ran %d queries (budget %d)',
+                               request.method, request.path, count, budget)
+        return response
+
+def strict_loading():
+    """Loader options for list queries: with RAISE_ON_LAZY_LOAD set (TestingConfig),
+    any relationship not eager-loaded explicitly raises instead of issuing an N+1 query"""
+    if current_app.config.get('RAISE_ON_LAZY_LOAD'):
+        return [raiseload('*')]
+    return []
+
+def update_columns(model, row_id, data, fields):
+    """Write the whitelisted keys of data to one row with a single UPDATE.
+
+    Returns False when no row has that id, so callers can 404 without a SELECT first.
+    """
+    values = {field: data[field] for field in fields if field in data}
+    if not values:
+        return db.session.query(model.id).filter_by(id=row_id).first() is not None
+    result = db.session.execute(
+        db.update(model).where(model.id == row_id).values(**values)
+    )
+    return result.rowcount > 0
+
+def month_bucket(column):
+    """SQL expression for the 'YYYY-MM' month of a date/datetime column"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return db.func.to_char(column, 'YYYY-MM')
+    return db.func.strftime('%Y-%m', column)
+
+def days_between(later, earlier):
+    """SQL expression for the fractional number of days from earlier to later"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return db.func.extract('epoch', later - earlier) / 86400
+    return db.func.julianday(later) - db.func.julianday(earlier)
+
+def is_uuid(value):
+    """True for a well-formed UUID string. Ids from request bodies are checked with
+    this before they reach a native uuid column, where a malformed one is a DataError."""
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
+
+class UUIDStringConverter(UUIDConverter):
+    """<uuid_str:name> route segment: a malformed id 404s before any query runs, a
+    valid one is passed on as the canonical string the models use"""
+    def to_python(self, value):
+        return str(uuid.UUID(value))
@@ -0,0 +1,26 @@
+"""Baseline: the schema db.create_all() built before migrations were added
+
+Nothing to run - existing databases are stamped with this revision.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-16 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
@@ -0,0 +1,67 @@
+"""Store primary and foreign keys as native uuid on PostgreSQL
+
+Other databases keep VARCHAR(36), which is what UUIDType maps to there.
+
+Revision ID: 0002_uuid_keys
+Revises: 0001_baseline
+Create Date: 2026-10-16 09:05:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_uuid_keys'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+# Every id / foreign key column declared with UUIDType
+UUID_COLUMNS = {
+    'users': ['id'],
+    'artisan_profiles': ['id', 'user_id', 'kyc_verified_by'],
+    'artisan_kyc_verifications': ['id', 'artisan_profile_id', 'reviewed_by'],
+    'admin_profiles': ['id', 'user_id'],
+    'service_categories': ['id'],
+    'service_requests': ['id', 'user_id', 'artisan_id', 'category_id'],
+    'notifications': ['id', 'user_id'],
+    'account_deactivations': ['id', 'user_id'],
+    'verification_requests': ['id', 'user_id', 'reviewed_by'],
+    'user_settings': ['id', 'user_id'],
+    'withdrawals': ['id', 'artisan_id'],
+    'reviews': ['id', 'service_request_id', 'reviewer_id', 'reviewee_id'],
+    'payments': ['id', 'service_request_id', 'user_id', 'verified_by'],
+    'payment_transactions': ['id', 'user_id', 'service_request_id'],
+}
+
+
+def _convert(type_name):
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # A foreign key and the key it references must change type together, so
+    # lift the constraints, convert every column, then put them back
+    inspector = sa.inspect(bind)
+    foreign_keys = [(table, fk) for table in UUID_COLUMNS
+                    for fk in inspector.get_foreign_keys(table)]
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+    for table, columns in UUID_COLUMNS.items():
+        for column in columns:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} '
+                       f'TYPE {type_name} USING {column}::{type_name}')
+
+    for table, fk in foreign_keys:
+        op.create_foreign_key(fk['name'], table, fk['referred_table'],
+                              fk['constrained_columns'], fk['referred_columns'])
+
+
+def upgrade():
+    _convert('uuid')
+
+
+def downgrade():
+    _convert('varchar(36)')
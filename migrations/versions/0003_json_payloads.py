@@ -0,0 +1,43 @@
+"""Store verification, settings and withdrawal payloads as jsonb on PostgreSQL
+
+The columns used to hold json.dumps() text. SQLite keeps the same TEXT storage
+under its JSON type, so the existing strings read back unchanged there.
+
+Revision ID: 0003_json_payloads
+Revises: 0002_uuid_keys
+Create Date: 2026-10-16 09:20:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_json_payloads'
+down_revision = '0002_uuid_keys'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = {
+    'verification_requests': ['request_data'],
+    'user_settings': ['settings_data'],
+    'withdrawals': ['account_details'],
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            # Empty strings were written for "no data"; they are not valid json
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} "
+                       f"TYPE jsonb USING NULLIF({column}, '')::jsonb")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} '
+                       f'TYPE text USING {column}::text')
@@ -0,0 +1,51 @@
+"""Native enum types for artisan availability and service request status
+
+SQLite stores db.Enum as VARCHAR without a constraint, so only PostgreSQL
+changes. Values outside the choices would fail the cast and are normalised
+first.
+
+Revision ID: 0004_enum_columns
+Revises: 0003_json_payloads
+Create Date: 2026-10-16 09:35:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_enum_columns'
+down_revision = '0003_json_payloads'
+branch_labels = None
+depends_on = None
+
+# (table, column, enum type, choices, fallback for unknown values)
+ENUM_COLUMNS = [
+    ('artisan_profiles', 'availability', 'artisan_availability',
+     ('available', 'busy', 'offline'), 'offline'),
+    ('service_requests', 'status', 'service_request_status',
+     ('pending', 'assigned', 'in_progress', 'completed', 'cancelled'), 'pending'),
+]
+
+
+def _quoted(values):
+    return ', '.join(f"'{value}'" for value in values)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, type_name, choices, fallback in ENUM_COLUMNS:
+        op.execute(f'CREATE TYPE {type_name} AS ENUM ({_quoted(choices)})')
+        op.execute(f"UPDATE {table} SET {column} = '{fallback}' "
+                   f"WHERE {column} IS NOT NULL AND {column} NOT IN ({_quoted(choices)})")
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} '
+                   f'TYPE {type_name} USING {column}::text::{type_name}')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, type_name, choices, fallback in ENUM_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} '
+                   f'TYPE varchar(20) USING {column}::text')
+        op.execute(f'DROP TYPE {type_name}')
@@ -0,0 +1,55 @@
+"""Constant column defaults supplied by the database
+
+Inserts leave these columns out when no value is set, so existing tables need
+the defaults too. Batch mode lets SQLite rebuild the tables it cannot ALTER.
+
+Revision ID: 0005_server_defaults
+Revises: 0004_enum_columns
+Create Date: 2026-10-16 09:50:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_server_defaults'
+down_revision = '0004_enum_columns'
+branch_labels = None
+depends_on = None
+
+ZERO = sa.text('0')
+
+SERVER_DEFAULTS = {
+    'users': {'is_active': sa.true(), 'is_verified': sa.false()},
+    'artisan_profiles': {
+        'experience_years': ZERO, 'availability': 'available', 'rating': ZERO,
+        'total_jobs': ZERO, 'completed_jobs': ZERO, 'min_service_fee': ZERO,
+        'total_earnings': ZERO, 'pending_balance': ZERO, 'available_balance': ZERO,
+        'kyc_status': 'pending', 'nationality': 'Nigerian',
+    },
+    'artisan_kyc_verifications': {'nationality': 'Nigerian', 'status': 'pending'},
+    'admin_profiles': {'is_super_admin': sa.false()},
+    'service_categories': {'is_active': sa.true()},
+    'service_requests': {'status': 'pending', 'payment_method': 'cash', 'payment_status': 'pending'},
+    'notifications': {'is_read': sa.false()},
+    'account_deactivations': {'is_permanent': sa.false()},
+    'verification_requests': {'status': 'pending'},
+    'withdrawals': {'status': 'pending'},
+    'payments': {'currency': 'NGN', 'payment_status': 'pending', 'payment_type': 'service_fee'},
+    'payment_transactions': {'transaction_status': 'pending'},
+}
+
+
+def upgrade():
+    for table, defaults in SERVER_DEFAULTS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column, default in defaults.items():
+                batch_op.alter_column(column, server_default=default)
+
+
+def downgrade():
+    for table, defaults in SERVER_DEFAULTS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in defaults:
+                batch_op.alter_column(column, server_default=None)
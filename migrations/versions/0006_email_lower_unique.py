@@ -0,0 +1,30 @@
+"""Case-insensitive email uniqueness
+
+Replaces the plain unique index on users.email with a unique index on
+lower(email), which User.by_email() and User.email_taken() match on. Creating
+it fails if two accounts differ only by case; merge those rows first.
+
+Revision ID: 0006_email_lower_unique
+Revises: 0005_server_defaults
+Create Date: 2026-10-16 10:05:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_email_lower_unique'
+down_revision = '0005_server_defaults'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_users_email', table_name='users')
+    op.create_index('ux_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_users_email_lower', table_name='users')
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
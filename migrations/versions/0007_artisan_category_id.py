@@ -0,0 +1,46 @@
+"""Link artisan profiles to service categories by id
+
+Adds artisan_profiles.category_id and fills it from the category name the
+profile already stores, so artisans created before this revision still match
+the id-based joins. Names with no matching category stay NULL.
+
+Revision ID: 0007_artisan_category_id
+Revises: 0006_email_lower_unique
+Create Date: 2026-10-16 10:20:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_artisan_category_id'
+down_revision = '0006_email_lower_unique'
+branch_labels = None
+depends_on = None
+
+UUIDType = sa.String(36).with_variant(postgresql.UUID(as_uuid=False), 'postgresql')
+
+
+def upgrade():
+    with op.batch_alter_table('artisan_profiles') as batch_op:
+        batch_op.add_column(sa.Column('category_id', UUIDType, nullable=True))
+        batch_op.create_foreign_key('artisan_profiles_category_id_fkey', 'service_categories',
+                                    ['category_id'], ['id'])
+        batch_op.create_index('ix_artisan_profiles_category_id', ['category_id'])
+        batch_op.create_index('ix_artisan_category_avail_rating',
+                              ['category_id', 'availability', sa.text('rating DESC')])
+
+    op.execute('UPDATE artisan_profiles SET category_id = ('
+               'SELECT service_categories.id FROM service_categories '
+               'WHERE service_categories.name = artisan_profiles.category) '
+               'WHERE category_id IS NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('artisan_profiles') as batch_op:
+        batch_op.drop_index('ix_artisan_category_avail_rating')
+        batch_op.drop_index('ix_artisan_profiles_category_id')
+        batch_op.drop_constraint('artisan_profiles_category_id_fkey', type_='foreignkey')
+        batch_op.drop_column('category_id')
@@ -0,0 +1,33 @@
+"""Store artisan credentials and portfolio images as jsonb on PostgreSQL
+
+Revision ID: 0008_profile_json_lists
+Revises: 0007_artisan_category_id
+Create Date: 2026-10-16 10:35:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_profile_json_lists'
+down_revision = '0007_artisan_category_id'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = ['credentials', 'portfolio_images']
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        op.execute(f"ALTER TABLE artisan_profiles ALTER COLUMN {column} "
+                   f"TYPE jsonb USING NULLIF({column}, '')::jsonb")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        op.execute(f'ALTER TABLE artisan_profiles ALTER COLUMN {column} '
+                   f'TYPE text USING {column}::text')
@@ -0,0 +1,97 @@
+"""Indexes for the list, queue and lookup queries
+
+Only the composites each query needs are kept. A foreign key or status column
+that leads a composite gets no index of its own. Databases built with
+db.create_all() from an intermediate version of the models may already have
+some of these indexes, or the redundant ones dropped here. Both are handled
+with IF [NOT] EXISTS.
+
+Revision ID: 0009_query_indexes
+Revises: 0008_profile_json_lists
+Create Date: 2026-10-16 10:50:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_query_indexes'
+down_revision = '0008_profile_json_lists'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial predicate as (postgresql, sqlite) or None)
+INDEXES = [
+    ('ix_user_type_verified_created', 'users',
+     ['user_type', 'is_verified', sa.text('created_at DESC')], None),
+    ('ix_service_requests_category_id', 'service_requests', ['category_id'], None),
+    ('ix_sr_user_status_created', 'service_requests', ['user_id', 'status', 'created_at'], None),
+    ('ix_sr_pending', 'service_requests', ['created_at'],
+     ("status = 'pending'", "status = 'pending'")),
+    ('ix_sr_status_created', 'service_requests', ['status', sa.text('created_at DESC')], None),
+    ('ix_sr_artisan_status_created', 'service_requests',
+     ['artisan_id', 'status', sa.text('created_at DESC')], None),
+    ('ix_notifications_notification_type', 'notifications', ['notification_type'], None),
+    ('ix_notif_unread', 'notifications', ['user_id', 'created_at'],
+     ('is_read = false', 'is_read = 0')),
+    ('ix_notif_user_created', 'notifications', ['user_id', sa.text('created_at DESC')], None),
+    ('ix_account_deactivations_user_id', 'account_deactivations', ['user_id'], None),
+    ('ix_verification_requests_user_id', 'verification_requests', ['user_id'], None),
+    ('ix_verification_requests_status', 'verification_requests', ['status'], None),
+    ('ix_withdrawals_artisan_id', 'withdrawals', ['artisan_id'], None),
+    ('ix_withdrawals_status', 'withdrawals', ['status'], None),
+    ('ix_wd_pending', 'withdrawals', ['requested_at'],
+     ("status = 'pending'", "status = 'pending'")),
+]
+
+# Covered by a composite above, or unusable (ix_user_active is on raw email
+# while every lookup goes through lower(email)). Same layout as INDEXES, so
+# downgrade() can put them back.
+REDUNDANT_INDEXES = [
+    ('ix_user_active', 'users', ['email'], ('is_active = true', 'is_active = 1')),
+    ('ix_service_requests_user_id', 'service_requests', ['user_id'], None),
+    ('ix_service_requests_artisan_id', 'service_requests', ['artisan_id'], None),
+    ('ix_service_requests_status', 'service_requests', ['status'], None),
+    ('ix_sr_artisan_created', 'service_requests', ['artisan_id', sa.text('created_at DESC')], None),
+    ('ix_notifications_user_id', 'notifications', ['user_id'], None),
+    ('ix_notifications_is_read', 'notifications', ['is_read'], None),
+    ('ix_notif_user_unread', 'notifications', ['user_id', 'is_read', 'created_at'], None),
+]
+
+
+def _create_indexes(indexes):
+    for name, table, columns, where in indexes:
+        kw = {}
+        if where:
+            kw = {'postgresql_where': sa.text(where[0]), 'sqlite_where': sa.text(where[1])}
+        op.create_index(name, table, columns, if_not_exists=True, **kw)
+
+
+def upgrade():
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+
+    for name, table, columns, where in REDUNDANT_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    _create_indexes(INDEXES)
+
+    # Postgres enforces unique payment references on an md5 digest rather than
+    # the 100-char string; SQLite keeps the unique constraint it already has
+    if is_postgresql:
+        op.drop_constraint('payment_transactions_transaction_reference_key',
+                           'payment_transactions', type_='unique')
+        op.create_index('ux_payment_transactions_ref_md5', 'payment_transactions',
+                        [sa.text('md5(transaction_reference)')], unique=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ux_payment_transactions_ref_md5', table_name='payment_transactions')
+        op.create_unique_constraint('payment_transactions_transaction_reference_key',
+                                    'payment_transactions', ['transaction_reference'])
+
+    for name, table, columns, where in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    _create_indexes(REDUNDANT_INDEXES)
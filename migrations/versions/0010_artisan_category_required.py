@@ -0,0 +1,50 @@
+"""Require a category on every artisan profile
+
+0007 filled category_id from the stored category name. Profiles whose name
+matched no category are given the category of that name, created inactive, so
+every artisan keeps a category and an admin can merge or activate it, then the
+column becomes NOT NULL.
+
+Revision ID: 0010_artisan_category_required
+Revises: 0009_query_indexes
+Create Date: 2026-10-16 11:05:00
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_artisan_category_required'
+down_revision = '0009_query_indexes'
+branch_labels = None
+depends_on = None
+
+UUIDType = sa.String(36).with_variant(postgresql.UUID(as_uuid=False), 'postgresql')
+
+
+def upgrade():
+    bind = op.get_bind()
+    unmatched = bind.execute(sa.text(
+        'SELECT DISTINCT category FROM artisan_profiles WHERE category_id IS NULL'
+    )).scalars().all()
+    for name in unmatched:
+        bind.execute(sa.text(
+            'INSERT INTO service_categories (id, name, is_active) VALUES (:id, :name, :active)'
+        ), {'id': str(uuid.uuid4()), 'name': name, 'active': False})
+
+    op.execute('UPDATE artisan_profiles SET category_id = ('
+               'SELECT service_categories.id FROM service_categories '
+               'WHERE service_categories.name = artisan_profiles.category) '
+               'WHERE category_id IS NULL')
+
+    with op.batch_alter_table('artisan_profiles') as batch_op:
+        batch_op.alter_column('category_id', existing_type=UUIDType, nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('artisan_profiles') as batch_op:
+        batch_op.alter_column('category_id', existing_type=UUIDType, nullable=True)
@@ -1,32 +1,62 @@
 # models.py - CORRECTED VERSION
 
+from flask import current_app, has_app_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import insert, lambda_stmt
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.mutable import MutableList
 from datetime import datetime, timezone
 from werkzeug.security import generate_password_hash, check_password_hash
+from uuid6 import uuid7
 import uuid
-import json
+import orjson
 
 db = SQLAlchemy()
 
+# IDs stay plain strings in Python; Postgres stores them as native 16-byte uuid
+UUIDType = db.String(36).with_variant(postgresql.UUID(as_uuid=False), 'postgresql')
+
+# Structured blobs come back as Python objects; Postgres stores them as binary JSONB
+JSONType = db.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
 def generate_uuid():
-    return str(uuid.uuid4())
+    # UUIDv7 is time-ordered, so new rows land at the right edge of the PK index
+    return str(uuid7())
+
+AVAILABILITY_CHOICES = ('available', 'busy', 'offline')
+REQUEST_STATUS_CHOICES = ('pending', 'assigned', 'in_progress', 'completed', 'cancelled')
+
+def _utcnow():
+    # Passed as a callable so SQLAlchemy evaluates it per row, not once at import
+    return datetime.now(timezone.utc)
+
+def _iso(value):
+    # Shared date/datetime formatter for the to_dict serializers
+    return value.isoformat() if value else None
+
+def hash_password(password):
+    """Hash a password with the configured PASSWORD_HASH_METHOD (scrypt unless overridden)"""
+    method = 'scrypt'
+    if has_app_context():
+        method = current_app.config.get('PASSWORD_HASH_METHOD', method)
+    return generate_password_hash(password, method=method)
 
 class User(UserMixin, db.Model):
     """Unified User Model with Roles"""
     __tablename__ = 'users'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    email = db.Column(db.String(120), unique=True, nullable=False, index=True)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    email = db.Column(db.String(120), nullable=False)  # unique case-insensitively, see ux_users_email_lower
     phone = db.Column(db.String(20), nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
     full_name = db.Column(db.String(100), nullable=False)
     user_type = db.Column(db.String(20), nullable=False)  # 'customer', 'artisan', 'admin'
     nin = db.Column(db.String(50), unique=True)  # National Identification Number
-    is_active = db.Column(db.Boolean, default=True)
-    is_verified = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    is_active = db.Column(db.Boolean, server_default=db.true())
+    is_verified = db.Column(db.Boolean, server_default=db.false())
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
     
     # Common fields for all users
     address = db.Column(db.Text)
@@ -36,8 +66,12 @@ class User(UserMixin, db.Model):
     artisan_profile = db.relationship('ArtisanProfile', backref='user', uselist=False, lazy=True, foreign_keys='ArtisanProfile.user_id')
     admin_profile = db.relationship('AdminProfile', backref='user', uselist=False, lazy=True, foreign_keys='AdminProfile.user_id')
     
+    # Service request relationships (paired with ServiceRequest.client / assigned_artisan)
+    client_requests = db.relationship('ServiceRequest', back_populates='client', lazy=True, foreign_keys='ServiceRequest.user_id')
+    assigned_requests = db.relationship('ServiceRequest', back_populates='assigned_artisan', lazy=True, foreign_keys='ServiceRequest.artisan_id')
+    
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -54,6 +88,44 @@ class User(UserMixin, db.Model):
     def is_admin(self):
         return self.user_type == 'admin'
     
+    @property
+    def availability(self):
+        """Artisan availability lives on the profile; None for other roles"""
+        return self.artisan_profile.availability if self.artisan_profile else None
+    
+    @availability.setter
+    def availability(self, value):
+        if self.artisan_profile:
+            self.artisan_profile.availability = value
+    
+    @classmethod
+    def by_email(cls, email):
+        """Case-insensitive login/registration lookup; the lambda statement is compiled once and cached"""
+        email = (email or '').strip().lower()
+        stmt = lambda_stmt(lambda: db.select(User).where(db.func.lower(User.email) == email))
+        return db.session.scalars(stmt).first()
+    
+    @classmethod
+    def email_taken(cls, email, exclude_id=None):
+        """Id-only existence check on the lower(email) unique index - no row is hydrated.
+        Pass exclude_id when a user changes their own email so a case-only edit is allowed."""
+        email = (email or '').strip().lower()
+        stmt = lambda_stmt(lambda: db.select(User.id).where(db.func.lower(User.email) == email).limit(1))
+        if exclude_id is not None:
+            stmt += lambda s: s.where(User.id != exclude_id)
+        return db.session.scalar(stmt) is not None
+    
+    @classmethod
+    def nin_taken(cls, nin):
+        return db.session.scalar(db.select(cls.id).filter_by(nin=nin).limit(1)) is not None
+    
+    @classmethod
+    def admin_ids(cls):
+        """IDs of active admins, used to fan out admin notifications"""
+        return db.session.scalars(
+            db.select(cls.id).filter_by(user_type='admin', is_active=True)
+        ).all()
+    
     def to_dict(self):
         base_dict = {
             'id': self.id,
@@ -63,7 +135,7 @@ class User(UserMixin, db.Model):
             'user_type': self.user_type,
             'is_active': self.is_active,
             'is_verified': self.is_verified,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': _iso(self.created_at)
         }
         
         # Add profile-specific data
@@ -78,33 +150,35 @@ class ArtisanProfile(db.Model):
     """Artisan-specific profile information"""
     __tablename__ = 'artisan_profiles'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), unique=True, nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), unique=True, nullable=False)
     
     # Artisan-specific fields
-    category = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False)  # display name, kept alongside category_id
+    category_id = db.Column(UUIDType, db.ForeignKey('service_categories.id'), nullable=False, index=True)
     skills = db.Column(db.Text)
-    credentials = db.Column(db.Text)  # JSON string of certifications
-    experience_years = db.Column(db.Integer, default=0)
-    availability = db.Column(db.String(20), default='available')  # available, busy, offline
-    rating = db.Column(db.Float, default=0.0)
-    total_jobs = db.Column(db.Integer, default=0)
-    completed_jobs = db.Column(db.Integer, default=0)
-    portfolio_images = db.Column(db.Text)  # JSON array of image paths
+    credentials = db.deferred(db.Column(JSONType))  # list of certifications
+    experience_years = db.Column(db.Integer, server_default=db.text('0'))
+    availability = db.Column(db.Enum(*AVAILABILITY_CHOICES, name='artisan_availability'), server_default='available')
+    rating = db.Column(db.Float, server_default=db.text('0'))
+    total_jobs = db.Column(db.Integer, server_default=db.text('0'))
+    completed_jobs = db.Column(db.Integer, server_default=db.text('0'))
+    # Mutable so in-place list edits (insert/remove) are flushed without reassignment
+    portfolio_images = db.deferred(db.Column(MutableList.as_mutable(JSONType)))  # list of image paths/dicts
     hourly_rate = db.Column(db.Float)
-    min_service_fee = db.Column(db.Float, default=0.0)
+    min_service_fee = db.Column(db.Float, server_default=db.text('0'))
     
     # Financial fields
-    total_earnings = db.Column(db.Float, default=0.0)
-    pending_balance = db.Column(db.Float, default=0.0)
-    available_balance = db.Column(db.Float, default=0.0)
+    total_earnings = db.Column(db.Float, server_default=db.text('0'))
+    pending_balance = db.Column(db.Float, server_default=db.text('0'))
+    available_balance = db.Column(db.Float, server_default=db.text('0'))
     
     # KYC Verification Fields
     nin = db.Column(db.String(50), unique=True)  # National Identification Number
-    kyc_status = db.Column(db.String(20), default='pending')  # pending, submitted, verified, rejected
+    kyc_status = db.Column(db.String(20), server_default='pending')  # pending, submitted, verified, rejected
     kyc_submitted_at = db.Column(db.DateTime(timezone=True))
     kyc_verified_at = db.Column(db.DateTime(timezone=True))
-    kyc_verified_by = db.Column(db.String(36), db.ForeignKey('users.id'))
+    kyc_verified_by = db.Column(UUIDType, db.ForeignKey('users.id'))
     
     # KYC Document URLs
     nin_front_image = db.Column(db.String(255))
@@ -115,7 +189,7 @@ class ArtisanProfile(db.Model):
     
     # Additional personal info for KYC
     date_of_birth = db.Column(db.Date)
-    nationality = db.Column(db.String(50), default='Nigerian')
+    nationality = db.Column(db.String(50), server_default='Nigerian')
     state_of_origin = db.Column(db.String(100))
     lga_of_origin = db.Column(db.String(100))
     
@@ -127,6 +201,7 @@ class ArtisanProfile(db.Model):
     
     # Relationship for KYC verifier
     kyc_verifier = db.relationship('User', foreign_keys=[kyc_verified_by], backref='verified_artisans_kyc')
+    service_category = db.relationship('ServiceCategory', foreign_keys=[category_id], lazy=True)
     
     def to_dict(self):
         base_dict = {
@@ -144,8 +219,8 @@ class ArtisanProfile(db.Model):
             # KYC Information
             'nin': self.nin,
             'kyc_status': self.kyc_status,
-            'kyc_submitted_at': self.kyc_submitted_at.isoformat() if self.kyc_submitted_at else None,
-            'kyc_verified_at': self.kyc_verified_at.isoformat() if self.kyc_verified_at else None,
+            'kyc_submitted_at': _iso(self.kyc_submitted_at),
+            'kyc_verified_at': _iso(self.kyc_verified_at),
             'is_kyc_verified': self.kyc_status == 'verified',
             
             # Bank Information
@@ -154,7 +229,7 @@ class ArtisanProfile(db.Model):
             'account_number': self.account_number,
             
             # Personal Information
-            'date_of_birth': self.date_of_birth.isoformat() if self.date_of_birth else None,
+            'date_of_birth': _iso(self.date_of_birth),
             'nationality': self.nationality,
             'state_of_origin': self.state_of_origin,
             'lga_of_origin': self.lga_of_origin
@@ -166,13 +241,13 @@ class ArtisanKYCVerification(db.Model):
     """Artisan KYC Verification Requests"""
     __tablename__ = 'artisan_kyc_verifications'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    artisan_profile_id = db.Column(db.String(36), db.ForeignKey('artisan_profiles.id'), nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    artisan_profile_id = db.Column(UUIDType, db.ForeignKey('artisan_profiles.id'), nullable=False)
     
     # Personal Information from submission
     nin = db.Column(db.String(50), nullable=False)
     date_of_birth = db.Column(db.Date)
-    nationality = db.Column(db.String(50), default='Nigerian')
+    nationality = db.Column(db.String(50), server_default='Nigerian')
     state_of_origin = db.Column(db.String(100))
     lga_of_origin = db.Column(db.String(100))
     
@@ -190,17 +265,17 @@ class ArtisanKYCVerification(db.Model):
     bank_code = db.Column(db.String(10))
     
     # Verification Status
-    status = db.Column(db.String(20), default='pending')  # pending, reviewing, verified, rejected
+    status = db.Column(db.String(20), server_default='pending')  # pending, reviewing, verified, rejected
     rejection_reason = db.Column(db.Text)
     
     # Reviewer Information
-    reviewed_by = db.Column(db.String(36), db.ForeignKey('users.id'))
+    reviewed_by = db.Column(UUIDType, db.ForeignKey('users.id'))
     reviewed_at = db.Column(db.DateTime(timezone=True))
     review_notes = db.Column(db.Text)
     
     # Metadata
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
     
     # Relationships
     artisan_profile = db.relationship('ArtisanProfile', foreign_keys=[artisan_profile_id], backref='kyc_submissions', lazy=True)
@@ -212,23 +287,23 @@ class ArtisanKYCVerification(db.Model):
             'artisan_profile_id': self.artisan_profile_id,
             'artisan_name': self.artisan_profile.user.full_name if self.artisan_profile and self.artisan_profile.user else None,
             'nin': self.nin,
-            'date_of_birth': self.date_of_birth.isoformat() if self.date_of_birth else None,
+            'date_of_birth': _iso(self.date_of_birth),
             'nationality': self.nationality,
             'state_of_origin': self.state_of_origin,
             'lga_of_origin': self.lga_of_origin,
             'status': self.status,
             'rejection_reason': self.rejection_reason,
             'reviewed_by': self.reviewed_by,
-            'reviewed_at': self.reviewed_at.isoformat() if self.reviewed_at else None,
+            'reviewed_at': _iso(self.reviewed_at),
             'review_notes': self.review_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': _iso(self.created_at),
             
             # Document URLs
             'nin_front_image': self.nin_front_image,
             'nin_back_image': self.nin_back_image,
             'passport_photo': self.passport_photo,
             'proof_of_address': self.proof_of_address,
-            'other_documents': json.loads(self.other_documents) if self.other_documents else [],
+            'other_documents': orjson.loads(self.other_documents) if self.other_documents else [],
             
             # Bank Information
             'bank_name': self.bank_name,
@@ -240,12 +315,12 @@ class AdminProfile(db.Model):
     """Admin-specific profile information"""
     __tablename__ = 'admin_profiles'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), unique=True, nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), unique=True, nullable=False)
     
     # Admin-specific fields
     username = db.Column(db.String(50), unique=True, nullable=False)
-    is_super_admin = db.Column(db.Boolean, default=False)
+    is_super_admin = db.Column(db.Boolean, server_default=db.false())
     department = db.Column(db.String(100))
     permissions = db.Column(db.Text)  # JSON string of permissions
     
@@ -260,12 +335,20 @@ class ServiceCategory(db.Model):
     """Service Categories Model"""
     __tablename__ = 'service_categories'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
     name = db.Column(db.String(100), nullable=False, unique=True)
     description = db.Column(db.Text)
     icon = db.Column(db.String(100))
-    is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
+    is_active = db.Column(db.Boolean, server_default=db.true())
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    
+    # Relationships
+    service_requests = db.relationship('ServiceRequest', back_populates='category_obj', lazy=True)
+    
+    @classmethod
+    def id_for_name(cls, name):
+        """Id of the active category with this name; None when there is none"""
+        return db.session.scalar(db.select(cls.id).filter_by(name=name, is_active=True))
     
     def to_dict(self):
         return {
@@ -279,35 +362,44 @@ class ServiceCategory(db.Model):
 class ServiceRequest(db.Model):
     """Service Request Model"""
     __tablename__ = 'service_requests'
-    
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    artisan_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
-    category_id = db.Column(db.String(36), db.ForeignKey('service_categories.id'), nullable=False)
+    __table_args__ = (
+        # "my requests with status X, newest first"
+        db.Index('ix_sr_user_status_created', 'user_id', 'status', 'created_at'),
+        # Admin queue of unassigned requests
+        db.Index('ix_sr_pending', 'created_at',
+                 postgresql_where=db.text("status = 'pending'"),
+                 sqlite_where=db.text("status = 'pending'")),
+    )
+    
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False)  # leads ix_sr_user_status_created
+    artisan_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=True)  # leads ix_sr_artisan_status_created
+    category_id = db.Column(UUIDType, db.ForeignKey('service_categories.id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     location = db.Column(db.String(200), nullable=False)
     preferred_date = db.Column(db.Date)
     preferred_time = db.Column(db.String(50))
-    status = db.Column(db.String(20), default='pending')
+    status = db.Column(db.Enum(*REQUEST_STATUS_CHOICES, name='service_request_status'), server_default='pending')  # leads ix_sr_status_created
     
     # Payment preferences
-    payment_method = db.Column(db.String(50), default='cash')
-    payment_status = db.Column(db.String(20), default='pending')
+    payment_method = db.Column(db.String(50), server_default='cash')
+    payment_status = db.Column(db.String(20), server_default='pending')
     price_estimate = db.Column(db.Float)
     actual_price = db.Column(db.Float)
     
-    # Other fields
-    admin_notes = db.Column(db.Text)
+    # Other fields (long text is deferred - list views never render it)
+    admin_notes = db.deferred(db.Column(db.Text))
     rating = db.Column(db.Integer)
-    feedback = db.Column(db.Text)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    feedback = db.deferred(db.Column(db.Text))
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
     
     # Relationships
-    client = db.relationship('User', foreign_keys=[user_id], backref='client_requests', lazy=True)
-    assigned_artisan = db.relationship('User', foreign_keys=[artisan_id], backref='assigned_requests', lazy=True)
-    category_obj = db.relationship('ServiceCategory', backref='service_requests', lazy=True)
+    client = db.relationship('User', foreign_keys=[user_id], back_populates='client_requests', lazy=True)
+    assigned_artisan = db.relationship('User', foreign_keys=[artisan_id], back_populates='assigned_requests', lazy=True)
+    # Categories are a tiny table read by every serializer/template, so load them in batch
+    category_obj = db.relationship('ServiceCategory', back_populates='service_requests', lazy='selectin')
     
     @property
     def category(self):
@@ -322,6 +414,9 @@ class ServiceRequest(db.Model):
         return self.category_obj.icon if self.category_obj else 'tools'
     
     def to_dict(self):
+        # Resolve each relationship once rather than per key
+        category = self.category_obj
+        artisan = self.assigned_artisan
         return {
             'id': self.id,
             'title': self.title,
@@ -332,38 +427,67 @@ class ServiceRequest(db.Model):
             'price_estimate': self.price_estimate,
             'actual_price': self.actual_price,
             'location': self.location,
-            'preferred_date': self.preferred_date.isoformat() if self.preferred_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'category_name': self.category_name,
+            'preferred_date': _iso(self.preferred_date),
+            'created_at': _iso(self.created_at),
+            'category_name': category.name if category else None,
             'category_id': self.category_id,
-            'category_icon': self.category_icon,
-            'artisan_name': self.assigned_artisan.full_name if self.assigned_artisan else None,
+            'category_icon': category.icon if category else 'tools',
+            'artisan_name': artisan.full_name if artisan else None,
             'artisan_id': self.artisan_id
         }
 
 class Notification(db.Model):
     """Notification System Model"""
     __tablename__ = 'notifications'
-    
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    __table_args__ = (
+        # Unread rows are a small minority, so a partial index stays tiny
+        db.Index('ix_notif_unread', 'user_id', 'created_at',
+                 postgresql_where=db.text('is_read = false'),
+                 sqlite_where=db.text('is_read = 0')),
+    )
+    
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False)  # leads ix_notif_user_created
     title = db.Column(db.String(200), nullable=False)
     message = db.Column(db.Text, nullable=False)
-    is_read = db.Column(db.Boolean, default=False)
-    notification_type = db.Column(db.String(50))
+    is_read = db.Column(db.Boolean, server_default=db.false())
+    notification_type = db.Column(db.String(50), index=True)
     related_id = db.Column(db.String(36))
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     
     # Relationship
     user = db.relationship('User', foreign_keys=[user_id], backref='user_notifications', lazy=True)
     
+    @classmethod
+    def for_user(cls, user_id, unread_only=False, limit=None):
+        """Newest-first notifications for a user via a cached lambda statement"""
+        stmt = lambda_stmt(lambda: db.select(Notification).where(Notification.user_id == user_id))
+        if unread_only:
+            stmt += lambda s: s.where(Notification.is_read == False)
+        stmt += lambda s: s.order_by(Notification.created_at.desc())
+        if limit:
+            stmt += lambda s: s.limit(limit)
+        return db.session.scalars(stmt).all()
+    
+    @classmethod
+    def unread_count(cls, user_id):
+        stmt = lambda_stmt(lambda: db.select(db.func.count(Notification.id)).where(
+            Notification.user_id == user_id, Notification.is_read == False))
+        return db.session.scalar(stmt)
+    
+    @classmethod
+    def bulk_create(cls, rows):
+        """Insert many notifications (dicts of column values) as one batched INSERT"""
+        if rows:
+            db.session.execute(insert(cls), rows)
+    
     def to_dict(self):
         return {
             'id': self.id,
             'title': self.title,
             'message': self.message,
             'is_read': self.is_read,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': _iso(self.created_at),
             'notification_type': self.notification_type,
             'related_id': self.related_id
         }
@@ -372,12 +496,12 @@ class AccountDeactivation(db.Model):
     """Track account deactivations"""
     __tablename__ = 'account_deactivations'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False, index=True)
     reason = db.Column(db.Text)
-    deactivated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
+    deactivated_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     reactivated_at = db.Column(db.DateTime(timezone=True), nullable=True)
-    is_permanent = db.Column(db.Boolean, default=False)
+    is_permanent = db.Column(db.Boolean, server_default=db.false())
     
     # Relationship
     user = db.relationship('User', foreign_keys=[user_id], backref='user_deactivations', lazy=True)
@@ -387,8 +511,8 @@ class AccountDeactivation(db.Model):
             'id': self.id,
             'user_id': self.user_id,
             'reason': self.reason,
-            'deactivated_at': self.deactivated_at.isoformat() if self.deactivated_at else None,
-            'reactivated_at': self.reactivated_at.isoformat() if self.reactivated_at else None,
+            'deactivated_at': _iso(self.deactivated_at),
+            'reactivated_at': _iso(self.reactivated_at),
             'is_permanent': self.is_permanent
         }
 
@@ -396,42 +520,48 @@ class VerificationRequest(db.Model):
     """Track verification requests"""
     __tablename__ = 'verification_requests'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
-    request_data = db.Column(db.Text)  # JSON string with verification data
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), server_default='pending', index=True)  # pending, approved, rejected
+    request_data = db.deferred(db.Column(JSONType))  # Verification data
     admin_notes = db.Column(db.Text)
-    reviewed_by = db.Column(db.String(36), db.ForeignKey('users.id'))
+    reviewed_by = db.Column(UUIDType, db.ForeignKey('users.id'))
     reviewed_at = db.Column(db.DateTime(timezone=True))
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
 
     # Relationships
     user = db.relationship('User', foreign_keys=[user_id], backref='user_verifications', lazy=True)
     reviewer = db.relationship('User', foreign_keys=[reviewed_by], backref='reviewed_verifications', lazy=True)
     
     def to_dict(self):
+        """Summary for list views - leaves out the request_data payload"""
         return {
             'id': self.id,
             'user_id': self.user_id,
             'status': self.status,
-            'request_data': json.loads(self.request_data) if self.request_data else None,
             'admin_notes': self.admin_notes,
             'reviewed_by': self.reviewed_by,
-            'reviewed_at': self.reviewed_at.isoformat() if self.reviewed_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'reviewed_at': _iso(self.reviewed_at),
+            'created_at': _iso(self.created_at)
         }
 
+    def to_detail_dict(self):
+        """Full representation including the request_data payload"""
+        detail = self.to_dict()
+        detail['request_data'] = self.request_data
+        return detail
+
 class UserSettings(db.Model):
     """Store user preferences and settings"""
     __tablename__ = 'user_settings'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False)
     settings_type = db.Column(db.String(50), nullable=False)  # 'notifications', 'privacy', 'appearance'
-    settings_data = db.Column(db.Text)  # JSON string with settings
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    settings_data = db.deferred(db.Column(JSONType))  # Settings dict
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
 
     # Relationship
     user = db.relationship('User', foreign_keys=[user_id], backref='user_settings_list', lazy=True)
@@ -441,21 +571,26 @@ class UserSettings(db.Model):
             'id': self.id,
             'user_id': self.user_id,
             'settings_type': self.settings_type,
-            'settings_data': json.loads(self.settings_data) if self.settings_data else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'settings_data': self.settings_data,
+            'updated_at': _iso(self.updated_at)
         }
 
 class Withdrawal(db.Model):
     """Withdrawal Model"""
     __tablename__ = 'withdrawals'
-    
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    artisan_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    __table_args__ = (
+        db.Index('ix_wd_pending', 'requested_at',
+                 postgresql_where=db.text("status = 'pending'"),
+                 sqlite_where=db.text("status = 'pending'")),
+    )
+    
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    artisan_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     method = db.Column(db.String(50), nullable=False)  # e.g., 'bank_transfer', 'paypal'
-    account_details = db.Column(db.Text)  # JSON string with account info
-    status = db.Column(db.String(20), default='pending')  # pending, completed, rejected
-    requested_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
+    account_details = db.deferred(db.Column(JSONType))  # Account info
+    status = db.Column(db.String(20), server_default='pending', index=True)  # pending, completed, rejected
+    requested_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     processed_at = db.Column(db.DateTime(timezone=True))
     
     # Relationship
@@ -468,21 +603,21 @@ class Withdrawal(db.Model):
             'amount': self.amount,
             'method': self.method,
             'status': self.status,
-            'requested_at': self.requested_at.isoformat() if self.requested_at else None,
-            'processed_at': self.processed_at.isoformat() if self.processed_at else None
+            'requested_at': _iso(self.requested_at),
+            'processed_at': _iso(self.processed_at)
         }
 
 class Review(db.Model):
     """Review Model"""
     __tablename__ = 'reviews'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    service_request_id = db.Column(db.String(36), db.ForeignKey('service_requests.id'), nullable=False)
-    reviewer_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    reviewee_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    service_request_id = db.Column(UUIDType, db.ForeignKey('service_requests.id'), nullable=False)
+    reviewer_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False)
+    reviewee_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False)
     rating = db.Column(db.Integer, nullable=False)  # 1-5
     comments = db.Column(db.Text)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     
     # Relationships
     service_request = db.relationship('ServiceRequest', foreign_keys=[service_request_id], backref='request_reviews', lazy=True)
@@ -497,23 +632,23 @@ class Review(db.Model):
             'reviewee_id': self.reviewee_id,
             'rating': self.rating,
             'comments': self.comments,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': _iso(self.created_at)
         }
 
 class Payment(db.Model):
     """Payment Model for service requests"""
     __tablename__ = 'payments'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    service_request_id = db.Column(db.String(36), db.ForeignKey('service_requests.id'), nullable=False)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    service_request_id = db.Column(UUIDType, db.ForeignKey('service_requests.id'), nullable=False)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False)
     
     # Payment details
     amount = db.Column(db.Float, nullable=False)
-    currency = db.Column(db.String(3), default='NGN')
+    currency = db.Column(db.String(3), server_default='NGN')
     payment_method = db.Column(db.String(50), nullable=False)
-    payment_status = db.Column(db.String(20), default='pending')
-    payment_type = db.Column(db.String(20), default='service_fee')
+    payment_status = db.Column(db.String(20), server_default='pending')
+    payment_type = db.Column(db.String(20), server_default='service_fee')
     
     # Company bank details
     company_account_name = db.Column(db.String(100))
@@ -533,15 +668,15 @@ class Payment(db.Model):
     # Dates
     payment_date = db.Column(db.DateTime(timezone=True))
     verified_at = db.Column(db.DateTime(timezone=True))
-    verified_by = db.Column(db.String(36), db.ForeignKey('users.id'))
+    verified_by = db.Column(UUIDType, db.ForeignKey('users.id'))
     
     # Notes
     admin_notes = db.Column(db.Text)
     payment_notes = db.Column(db.Text)
     
     # Metadata
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
     
     # Relationships
     service_request = db.relationship('ServiceRequest', backref='request_payments', lazy=True)
@@ -581,9 +716,9 @@ class Payment(db.Model):
             } if self.payer_account_name else None,
             'receipt_image': self.receipt_image,
             'transaction_reference': self.transaction_reference,
-            'payment_date': self.payment_date.isoformat() if self.payment_date else None,
+            'payment_date': _iso(self.payment_date),
             'payment_notes': self.payment_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': _iso(self.created_at),
             'verified': self.verified_at is not None
         }
 
@@ -591,15 +726,15 @@ class PaymentTransaction(db.Model):
     """Payment Transaction Model"""
     __tablename__ = 'payment_transactions'
     
-    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    service_request_id = db.Column(db.String(36), db.ForeignKey('service_requests.id'), nullable=False)
+    id = db.Column(UUIDType, primary_key=True, default=generate_uuid)
+    user_id = db.Column(UUIDType, db.ForeignKey('users.id'), nullable=False)
+    service_request_id = db.Column(UUIDType, db.ForeignKey('service_requests.id'), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     payment_method = db.Column(db.String(50), nullable=False)
-    transaction_status = db.Column(db.String(20), default='pending')
-    transaction_reference = db.Column(db.String(100), unique=True)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = db.Column(db.DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    transaction_status = db.Column(db.String(20), server_default='pending')
+    transaction_reference = db.Column(db.String(100))  # unique via the indexes below
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
+    updated_at = db.Column(db.DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
     
     # Relationships
     user = db.relationship('User', foreign_keys=[user_id], backref='user_transactions', lazy=True)
@@ -614,5 +749,38 @@ class PaymentTransaction(db.Model):
             'payment_method': self.payment_method,
             'transaction_status': self.transaction_status,
             'transaction_reference': self.transaction_reference,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+            'created_at': _iso(self.created_at)
+        }
+
+
+# Emails are unique regardless of case; by_email() matches on the same lower()
+# expression so logins are served by this index
+db.Index('ux_users_email_lower', db.func.lower(User.email), unique=True)
+
+# Admin request list filtered by status, newest first
+db.Index('ix_sr_status_created', ServiceRequest.status, ServiceRequest.created_at.desc())
+
+# Artisan job lists and earnings: one artisan, filtered by status, newest first.
+# Lists with no status filter use the artisan_id prefix.
+db.Index('ix_sr_artisan_status_created',
+         ServiceRequest.artisan_id, ServiceRequest.status, ServiceRequest.created_at.desc())
+
+# A user's notification feed, newest first
+db.Index('ix_notif_user_created', Notification.user_id, Notification.created_at.desc())
+
+# Pending artisan verifications, newest first
+db.Index('ix_user_type_verified_created',
+         User.user_type, User.is_verified, User.created_at.desc())
+
+# "Best available artisan in this category"
+db.Index('ix_artisan_category_avail_rating',
+         ArtisanProfile.category_id, ArtisanProfile.availability, ArtisanProfile.rating.desc())
+
+# Payment references are only ever matched by equality, so Postgres enforces
+# uniqueness on a fixed-size md5 digest instead of the full 100-char string
+db.Index('ux_payment_transactions_ref_md5',
+         db.func.md5(PaymentTransaction.transaction_reference),
+         unique=True).ddl_if(dialect='postgresql')
+db.Index('ux_payment_transactions_ref',
+         PaymentTransaction.transaction_reference,
+         unique=True).ddl_if(dialect='sqlite')
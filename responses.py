@@ -0,0 +1,85 @@
+from decimal import Decimal
+from functools import wraps
+from flask import Response, request, render_template, stream_with_context
+from flask.json.provider import JSONProvider
+from flask_sqlalchemy.pagination import Pagination
+import orjson
+
+def _default(obj):
+    # Models serialize through their own to_dict(), rows by label; orjson handles dates natively
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, '_mapping'):  # column-projection Row
+        return dict(obj._mapping)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+# Datetimes come out as isoformat() does, naive ones without an offset, so column
+# projections (job_rows) match the to_dict() payloads built with models._iso().
+# Non-str dict keys are stringified as the stdlib json module did.
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def dumps(obj):
+    """orjson-encode obj (bytes), serialising models through to_dict()"""
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+def dumps_text(obj):
+    """dumps() as str, for APIs that want text (SQLAlchemy JSON columns, Redis)"""
+    return dumps(obj).decode()
+
+class OrjsonProvider(JSONProvider):
+    """app.json backed by orjson, so jsonify() and |tojson share the fast encoder"""
+    def dumps(self, obj, **kwargs):
+        option = OPTIONS
+        if kwargs.get('sort_keys'):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype='application/json')
+
+def ojsonify(obj, status=200):
+    """Drop-in for jsonify() on large payloads, encoded with orjson"""
+    return Response(dumps(obj), status=status, mimetype='application/json')
+
+def stream_json_list(key, query, batch_size=500):
+    """Stream {"<key>": [...]} one row at a time, fetching batch_size rows per round-trip"""
+    def generate():
+        yield b'{' + orjson.dumps(key) + b':['
+        for i, row in enumerate(query.yield_per(batch_size)):
+            if i:
+                yield b','
+            yield dumps(row)
+        yield b']}'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+def pagination_meta(paginated):
+    """The JSON form of a Pagination: page numbers and totals, no items"""
+    return {
+        'page': paginated.page,
+        'per_page': paginated.per_page,
+        'total': paginated.total,
+        'pages': paginated.pages
+    }
+
+def render_or_json(template):
+    """Let a view return one context dict: JSON clients get it through ojsonify
+    (models via to_dict, Pagination objects via pagination_meta), browsers get it
+    rendered into template with the Pagination objects intact"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            data = f(*args, **kwargs)
+            if not isinstance(data, dict):
+                return data  # already a response (redirect, stream, error tuple)
+            if request.is_json:
+                return ojsonify({key: pagination_meta(value) if isinstance(value, Pagination) else value
+                                 for key, value in data.items()})
+            return render_template(template, **data)
+        return wrapper
+    return decorator
@@ -1,17 +1,57 @@
-from flask import Blueprint, request, jsonify, render_template, redirect, url_for
-from flask_login import login_required, current_user
+from flask import Blueprint, request, jsonify, render_template, redirect, url_for, current_app, abort
+from flask_login import current_user
 from functools import wraps
-from models import db, User, ServiceRequest, ServiceCategory, Notification
+from models import db, User, ServiceRequest, ServiceCategory, Notification, ArtisanProfile, REQUEST_STATUS_CHOICES
+from sqlalchemy.orm import selectinload, load_only
+import cache
+from responses import ojsonify, stream_json_list, render_or_json
+from tasks import enqueue_notifications
+from db_utils import is_uuid, strict_loading, update_columns
 from datetime import datetime, timedelta
 import json
 
 admin_bp = Blueprint('admin_bp', __name__)
 
+DASHBOARD_STATS_KEY = 'admin:dashboard:stats'
+DASHBOARD_STATS_TTL = 30  # seconds
+MAX_PER_PAGE = 200
+MAX_BATCH_PATHS = 10
+
+# Allowed service request status changes (current -> next)
+VALID_TRANSITIONS = {
+    'pending': frozenset({'assigned', 'cancelled'}),
+    'assigned': frozenset({'in_progress', 'cancelled'}),
+    'in_progress': frozenset({'completed', 'cancelled'}),
+    'completed': frozenset(),
+    'cancelled': frozenset()
+}
+# Statuses that free the assigned artisan
+RELEASING_STATUSES = frozenset({'completed', 'cancelled'})
+
+# Columns the list views serialize - skips password hashes, addresses and other blobs
+USER_LIST_COLUMNS = (User.id, User.email, User.phone, User.full_name, User.user_type,
+                     User.is_active, User.is_verified, User.created_at)
+REQUEST_LIST_COLUMNS = (ServiceRequest.id, ServiceRequest.user_id, ServiceRequest.artisan_id,
+                        ServiceRequest.category_id, ServiceRequest.title, ServiceRequest.description,
+                        ServiceRequest.status, ServiceRequest.payment_method, ServiceRequest.payment_status,
+                        ServiceRequest.price_estimate, ServiceRequest.actual_price, ServiceRequest.location,
+                        ServiceRequest.preferred_date, ServiceRequest.created_at)
+
+def pagination_args(default_per_page=50):
+    """Read page/per_page from the query string, capping the page size"""
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = request.args.get('per_page', default_per_page, type=int)
+    return page, min(max(per_page, 1), MAX_PER_PAGE)
+
 # Admin Authentication Middleware
 def admin_required(f):
     @wraps(f)
-    @login_required
     def decorated(*args, **kwargs):
+        # Flat check instead of stacking login_required: one wrapper per view
+        if not current_user.is_authenticated:
+            if request.is_json:
+                return jsonify({'error': 'Authentication required'}), 401
+            return current_app.login_manager.unauthorized()
         if current_user.user_type != 'admin':
             if request.is_json:
                 return jsonify({'error': 'Admin access required'}), 403
@@ -24,68 +64,152 @@ def admin_required(f):
 @admin_bp.route('/dashboard')
 @admin_required
 def admin_dashboard():
-    # Get statistics
-    total_users = User.query.count()
-    total_artisans = User.query.filter_by(user_type='artisan').count()
-    total_requests = ServiceRequest.query.count()
-    pending_requests = ServiceRequest.query.filter_by(status='pending').count()
-    active_requests = ServiceRequest.query.filter_by(status='in_progress').count()
-    completed_requests = ServiceRequest.query.filter_by(status='completed').count()
-    pending_verifications = User.query.filter_by(user_type='artisan', is_verified=False).count()
-    
-    # Recent requests
-    recent_requests = ServiceRequest.query\
+    stats = cache.get_json(DASHBOARD_STATS_KEY)
+    if stats is None:
+        stats = dashboard_stats()
+        cache.set_json(DASHBOARD_STATS_KEY, stats, DASHBOARD_STATS_TTL)
+    
+    if request.is_json:
+        return _admin_dashboard_json(stats)
+    return _admin_dashboard_html(stats)
+
+def _recent_requests(*loaders):
+    return ServiceRequest.query\
+        .options(*loaders, *strict_loading())\
         .order_by(ServiceRequest.created_at.desc())\
         .limit(10)\
         .all()
+
+def _admin_dashboard_json(stats):
+    # to_dict() reads the category and the assigned artisan
+    recent_requests = _recent_requests(selectinload(ServiceRequest.category_obj),
+                                       selectinload(ServiceRequest.assigned_artisan))
+    return jsonify({
+        'stats': stats,
+        'recent_requests': [req.to_dict() for req in recent_requests]
+    })
+
+def _admin_dashboard_html(stats):
+    # The template reads the category and the client; pending artisans are HTML-only
+    recent_requests = _recent_requests(selectinload(ServiceRequest.category_obj),
+                                       selectinload(ServiceRequest.client))
     
-    # Pending verifications
     pending_artisans = User.query.filter_by(user_type='artisan', is_verified=False)\
         .order_by(User.created_at.desc())\
         .limit(5)\
         .all()
     
-    if request.is_json:
-        return jsonify({
-            'stats': {
-                'total_users': total_users,
-                'total_artisans': total_artisans,
-                'total_requests': total_requests,
-                'pending_requests': pending_requests,
-                'active_requests': active_requests,
-                'completed_requests': completed_requests,
-                'pending_verifications': pending_verifications
-            },
-            'recent_requests': [req.to_dict() for req in recent_requests]
-        })
-    else:
-        return render_template('admin/dashboard.html',
-                              stats={
-                                  'total_users': total_users,
-                                  'total_artisans': total_artisans,
-                                  'total_requests': total_requests,
-                                  'pending_requests': pending_requests,
-                                  'active_requests': active_requests,
-                                  'completed_requests': completed_requests,
-                                  'pending_verifications': pending_verifications
-                              },
-                              recent_requests=recent_requests,
-                              pending_verifications=pending_artisans)
+    return render_template('admin/dashboard.html',
+                          stats=stats,
+                          recent_requests=recent_requests,
+                          pending_verifications=pending_artisans)
+
+@admin_bp.route('/batch', methods=['POST'])
+@admin_required
+def admin_batch():
+    """Run several admin GET endpoints in-process and return their JSON keyed by path"""
+    data = request.get_json() or {}
+    paths = data.get('paths') or []
+    
+    if not isinstance(paths, list) or len(paths) > MAX_BATCH_PATHS:
+        return jsonify({'error': f'Provide up to {MAX_BATCH_PATHS} paths'}), 400
+    
+    # Sub-requests reuse the caller's session cookie, so admin_required applies to each
+    headers = {'Content-Type': 'application/json', 'Cookie': request.headers.get('Cookie', '')}
+    results = {}
+    for path in paths:
+        if not isinstance(path, str) or not path.startswith('/admin/') or path.startswith(request.path):
+            results[path] = {'status': 400, 'body': {'error': 'Only /admin/ GET endpoints can be batched'}}
+            continue
+        
+        # A fresh app context gives each sub-request its own g (and current_user) and its own
+        # scoped db session; anything it leaves uncommitted is rolled back before the next one.
+        # The body is read before the contexts close: a streamed one can't be read after.
+        with current_app.app_context(), \
+                current_app.test_request_context(path, method='GET', headers=headers):
+            try:
+                response = current_app.full_dispatch_request()
+                if response.is_streamed:
+                    results[path] = {'status': 400, 'body': {'error': 'Streamed endpoints cannot be batched'}}
+                else:
+                    results[path] = {'status': response.status_code, 'body': response.get_json(silent=True)}
+            except Exception:
+                # One failing widget must not fail the whole batch
+                current_app.logger.exception('Batched request to %s failed', path)
+                results[path] = {'status': 500, 'body': None}
+            finally:
+                db.session.rollback()
+    
+    return jsonify({'results': results})
+
+def dashboard_stats():
+    """Dashboard counters - every count comes back from one UNION ALL round-trip"""
+    is_artisan = User.user_type == 'artisan'
+    stmt = db.union_all(
+        db.select(db.literal('users'), db.literal('total'), db.func.count(User.id)),
+        db.select(db.literal('users'), db.literal('artisans'), db.func.count(User.id))
+            .where(is_artisan),
+        db.select(db.literal('users'), db.literal('pending_verifications'), db.func.count(User.id))
+            .where(is_artisan, User.is_verified == False),
+        # Enum status is cast so its type lines up with the literal keys above
+        db.select(db.literal('requests'), db.cast(ServiceRequest.status, db.String), db.func.count(ServiceRequest.id))
+            .group_by(ServiceRequest.status)
+    )
+    
+    users = {}
+    requests_by_status = {}
+    for kind, key, count in db.session.execute(stmt):
+        (users if kind == 'users' else requests_by_status)[key] = count
+    
+    return {
+        'total_users': users.get('total', 0),
+        'total_artisans': users.get('artisans', 0),
+        'total_requests': sum(requests_by_status.values()),
+        'pending_requests': requests_by_status.get('pending', 0),
+        'assigned_requests': requests_by_status.get('assigned', 0),
+        'active_requests': requests_by_status.get('in_progress', 0),
+        'completed_requests': requests_by_status.get('completed', 0),
+        'pending_verifications': users.get('pending_verifications', 0)
+    }
 
 # User Management
 @admin_bp.route('/users', methods=['GET'])
 @admin_required
+@render_or_json('admin/manage_users.html')
 def manage_users():
-    users = User.query.all()
-    
-    if request.is_json:
-        return jsonify({'users': [user.to_dict() for user in users]})
-    else:
-        return render_template('admin/manage_users.html', users=users)
+    # to_dict() reads the artisan or admin profile of each row; selectinload also
+    # batches per yield_per chunk, so the streamed export gets the same loads
+    query = User.query.options(load_only(*USER_LIST_COLUMNS),
+                               selectinload(User.artisan_profile),
+                               selectinload(User.admin_profile),
+                               *strict_loading())\
+        .order_by(User.created_at.desc())
+    
+    # Full export: stream every row instead of building one big list
+    if request.is_json and request.args.get('all') == '1':
+        return stream_json_list('users', query)
+    
+    page, per_page = pagination_args()
+    paginated_users = query.paginate(page=page, per_page=per_page, error_out=False)
+    
+    return {
+        'users': paginated_users.items,
+        'pagination': paginated_users
+    }
 
-@admin_bp.route('/users/<user_id>', methods=['GET', 'PUT', 'DELETE'])
+@admin_bp.route('/users/<uuid_str:user_id>', methods=['GET', 'PUT', 'DELETE'])
 @admin_required
 def manage_user(user_id):
+    if request.method == 'PUT':
+        data = request.get_json()
+        
+        if not update_columns(User, user_id, data, ('is_active', 'is_verified')):
+            abort(404)
+        
+        db.session.commit()
+        cache.delete(DASHBOARD_STATS_KEY)  # pending verification count may have changed
+        return jsonify({'message': 'User updated successfully'})
+    
     user = User.query.get_or_404(user_id)
     
     if request.method == 'GET':
@@ -94,33 +218,34 @@ def manage_user(user_id):
         else:
             return render_template('admin/view_user.html', user=user)
     
-    elif request.method == 'PUT':
-        data = request.get_json()
-        
-        if 'is_active' in data:
-            user.is_active = data['is_active']
-        
-        if 'is_verified' in data:
-            user.is_verified = data['is_verified']
-        
-        db.session.commit()
-        return jsonify({'message': 'User updated successfully'})
-    
     elif request.method == 'DELETE':
         db.session.delete(user)
         db.session.commit()
+        cache.delete(DASHBOARD_STATS_KEY)
         return jsonify({'message': 'User deleted successfully'})
 
 # Artisan Management
 @admin_bp.route('/artisans', methods=['GET'])
 @admin_required
+@render_or_json('admin/manage_artisans.html')
 def manage_artisans():
-    artisans = User.query.filter_by(user_type='artisan').all()
-    
-    if request.is_json:
-        return jsonify({'artisans': [artisan.to_dict() for artisan in artisans]})
-    else:
-        return render_template('admin/manage_artisans.html', artisans=artisans)
+    query = User.query.filter_by(user_type='artisan')\
+        .options(load_only(*USER_LIST_COLUMNS),
+                 selectinload(User.artisan_profile),
+                 *strict_loading())\
+        .order_by(User.created_at.desc())
+    
+    # Full export: stream every row instead of building one big list
+    if request.is_json and request.args.get('all') == '1':
+        return stream_json_list('artisans', query)
+    
+    page, per_page = pagination_args()
+    paginated_artisans = query.paginate(page=page, per_page=per_page, error_out=False)
+    
+    return {
+        'artisans': paginated_artisans.items,
+        'pagination': paginated_artisans
+    }
 
 @admin_bp.route('/artisans/pending-verification', methods=['GET'])
 @admin_required
@@ -132,28 +257,28 @@ def get_pending_verification():
     else:
         return render_template('admin/verify_artisans.html', artisans=artisans)
 
-@admin_bp.route('/artisans/<artisan_id>/verify', methods=['PUT'])
+@admin_bp.route('/artisans/<uuid_str:artisan_id>/verify', methods=['PUT'])
 @admin_required
 def verify_artisan(artisan_id):
-    artisan = User.query.get_or_404(artisan_id)
-    
     data = request.get_json()
-    artisan.is_verified = data.get('verified', True)
-    
-    # Create notification for artisan
-    notification = Notification(
-        user_id=artisan.id,
-        user_type='artisan',
-        title='Account Verified',
-        message='Your artisan account has been verified by admin.',
-        notification_type='account_verified'
-    )
-    db.session.add(notification)
+    
+    if not update_columns(User, artisan_id, {'is_verified': data.get('verified', True)}, ('is_verified',)):
+        abort(404)
+    
     db.session.commit()
+    cache.delete(DASHBOARD_STATS_KEY)
+    
+    # Notify the artisan off the request path
+    enqueue_notifications([{
+        'user_id': artisan_id,
+        'title': 'Account Verified',
+        'message': 'Your artisan account has been verified by admin.',
+        'notification_type': 'account_verified'
+    }])
     
     return jsonify({'message': 'Artisan verification status updated'})
 
-@admin_bp.route('/artisans/<artisan_id>', methods=['GET', 'PUT', 'DELETE'])
+@admin_bp.route('/artisans/<uuid_str:artisan_id>', methods=['GET', 'PUT', 'DELETE'])
 @admin_required
 def manage_artisan(artisan_id):
     artisan = User.query.get_or_404(artisan_id)
@@ -181,63 +306,76 @@ def manage_artisan(artisan_id):
     elif request.method == 'DELETE':
         db.session.delete(artisan)
         db.session.commit()
+        cache.delete(DASHBOARD_STATS_KEY)
         return jsonify({'message': 'Artisan deleted successfully'})
 
 # Service Request Management
 @admin_bp.route('/service-requests', methods=['GET'])
 @admin_required
+@render_or_json('admin/manage_requests.html')
 def manage_requests():
     status = request.args.get('status')
-    
-    query = ServiceRequest.query
+    page, per_page = pagination_args()
+    
+    # Load the related rows in one batch per relationship instead of per request
+    query = ServiceRequest.query.options(
+        load_only(*REQUEST_LIST_COLUMNS),
+        selectinload(ServiceRequest.category_obj),
+        selectinload(ServiceRequest.client),
+        selectinload(ServiceRequest.assigned_artisan),
+        *strict_loading()
+    )
     
     if status:
+        if status not in REQUEST_STATUS_CHOICES:
+            if request.is_json:
+                return jsonify({'error': 'Invalid status filter'}), 400
+            return render_template('error.html', message='Invalid status filter'), 400
         query = query.filter_by(status=status)
     
-    service_requests = query.order_by(ServiceRequest.created_at.desc()).all()
+    paginated_requests = query.order_by(ServiceRequest.created_at.desc())\
+        .paginate(page=page, per_page=per_page, error_out=False)
     
-    if request.is_json:
-        return jsonify({'service_requests': [req.to_dict() for req in service_requests]})
-    else:
-        return render_template('admin/manage_requests.html', 
-                              requests=service_requests,
-                              status_filter=status)
+    # The template iterates service_requests, the same key JSON clients read
+    return {
+        'service_requests': paginated_requests.items,
+        'pagination': paginated_requests,
+        'status_filter': status
+    }
 
-@admin_bp.route('/service-requests/<request_id>', methods=['GET'])
+@admin_bp.route('/service-requests/<uuid_str:request_id>', methods=['GET'])
 @admin_required
+@render_or_json('admin/view_request.html')
 def view_request_admin(request_id):
     service_request = ServiceRequest.query.get_or_404(request_id)
     
     # Get available artisans for this category
-    available_artisans = User.query.filter_by(
-        user_type='artisan',
-        category=service_request.category.name,
-        is_verified=True,
-        is_active=True
-    ).all()
-    
-    if request.is_json:
-        return jsonify({
-            'request': service_request.to_dict(),
-            'available_artisans': [artisan.to_dict() for artisan in available_artisans]
-        })
-    else:
-        return render_template('admin/view_request.html', 
-                              request=service_request,
-                              available_artisans=available_artisans)
+    available_artisans = User.query.join(User.artisan_profile).filter(
+        ArtisanProfile.category_id == service_request.category_id,
+        User.user_type == 'artisan',
+        User.is_verified == True,
+        User.is_active == True
+    ).order_by(ArtisanProfile.rating.desc()).all()
+    
+    return {
+        'request': service_request,
+        'available_artisans': available_artisans
+    }
 
-@admin_bp.route('/service-requests/<request_id>/assign', methods=['POST'])
+@admin_bp.route('/service-requests/<uuid_str:request_id>/assign', methods=['POST'])
 @admin_required
 def assign_artisan(request_id):
-    service_request = ServiceRequest.query.get_or_404(request_id)
+    service_request = db.get_or_404(ServiceRequest, request_id)
     
     if service_request.status != 'pending':
         return jsonify({'error': 'Only pending requests can be assigned'}), 400
     
     data = request.get_json()
     artisan_id = data['artisan_id']
+    if not is_uuid(artisan_id):
+        abort(404)
     
-    artisan = User.query.get_or_404(artisan_id)
+    artisan = db.get_or_404(User, artisan_id)
     
     # Check artisan availability
     if artisan.availability != 'available':
@@ -251,87 +389,71 @@ def assign_artisan(request_id):
     # Update artisan availability
     artisan.availability = 'busy'
     
-    # Create notifications
-    # For artisan
-    artisan_notification = Notification(
-        user_id=artisan_id,
-        user_type='artisan',
-        title='New Job Assigned',
-        message=f'You have been assigned a new job: {service_request.title}',
-        notification_type='job_assigned',
-        related_id=request_id
-    )
-    
-    # For user
-    user_notification = Notification(
-        user_id=service_request.user_id,
-        user_type='user',
-        title='Artisan Assigned',
-        message=f'An artisan has been assigned to your service request: {service_request.title}',
-        notification_type='artisan_assigned',
-        related_id=request_id
-    )
-    
-    db.session.add(artisan_notification)
-    db.session.add(user_notification)
     db.session.commit()
+    cache.delete(DASHBOARD_STATS_KEY)
+    cache.invalidate_artisan_dashboard(artisan_id)
+    
+    # Notify the artisan and the user off the request path
+    enqueue_notifications([
+        {
+            'user_id': artisan_id,
+            'title': 'New Job Assigned',
+            'message': f'You have been assigned a new job: {service_request.title}',
+            'notification_type': 'job_assigned',
+            'related_id': request_id
+        },
+        {
+            'user_id': service_request.user_id,
+            'title': 'Artisan Assigned',
+            'message': f'An artisan has been assigned to your service request: {service_request.title}',
+            'notification_type': 'artisan_assigned',
+            'related_id': request_id
+        }
+    ])
     
     return jsonify({'message': 'Artisan assigned successfully'})
 
-@admin_bp.route('/service-requests/<request_id>/status', methods=['PUT'])
+@admin_bp.route('/service-requests/<uuid_str:request_id>/status', methods=['PUT'])
 @admin_required
 def update_request_status(request_id):
-    service_request = ServiceRequest.query.get_or_404(request_id)
+    service_request = db.get_or_404(ServiceRequest, request_id)
     
     data = request.get_json()
     new_status = data['status']
     
     # Validate status transition
-    valid_transitions = {
-        'pending': ['assigned', 'cancelled'],
-        'assigned': ['in_progress', 'cancelled'],
-        'in_progress': ['completed', 'cancelled'],
-        'completed': [],
-        'cancelled': []
-    }
-    
-    if new_status not in valid_transitions.get(service_request.status, []):
+    if new_status not in VALID_TRANSITIONS.get(service_request.status, frozenset()):
         return jsonify({'error': 'Invalid status transition'}), 400
     
     service_request.status = new_status
     
     # Update artisan availability if job is completed or cancelled
-    if new_status in ['completed', 'cancelled'] and service_request.artisan_id:
+    if new_status in RELEASING_STATUSES and service_request.artisan_id:
         artisan = service_request.assigned_artisan
         artisan.availability = 'available'
     
-    # Create notification for user
-    notification = Notification(
-        user_id=service_request.user_id,
-        user_type='user',
-        title='Service Status Updated',
-        message=f'Your service request status has been updated to: {new_status}',
-        notification_type='status_update',
-        related_id=request_id
-    )
-    
-    db.session.add(notification)
     db.session.commit()
+    cache.delete(DASHBOARD_STATS_KEY)
+    cache.invalidate_artisan_dashboard(service_request.artisan_id)
+    
+    # Notify the user off the request path
+    enqueue_notifications([{
+        'user_id': service_request.user_id,
+        'title': 'Service Status Updated',
+        'message': f'Your service request status has been updated to: {new_status}',
+        'notification_type': 'status_update',
+        'related_id': request_id
+    }])
     
     return jsonify({'message': 'Status updated successfully'})
 
-@admin_bp.route('/service-requests/<request_id>/price', methods=['PUT'])
+@admin_bp.route('/service-requests/<uuid_str:request_id>/price', methods=['PUT'])
 @admin_required
 def update_request_price(request_id):
-    service_request = ServiceRequest.query.get_or_404(request_id)
-    
     data = request.get_json()
     
-    if 'price_estimate' in data:
-        service_request.price_estimate = data['price_estimate']
-    
-    if 'actual_price' in data:
-        service_request.actual_price = data['actual_price']
+    if not update_columns(ServiceRequest, request_id, data, ('price_estimate', 'actual_price')):
+        abort(404)
     
     db.session.commit()
     return jsonify({'message': 'Price updated successfully'})
@@ -341,10 +463,10 @@ def update_request_price(request_id):
 @admin_required
 def manage_categories():
     if request.method == 'GET':
-        categories = ServiceCategory.query.all()
+        categories = cache.get_categories()
         
         if request.is_json:
-            return jsonify({'categories': [cat.to_dict() for cat in categories]})
+            return jsonify({'categories': categories})
         else:
             return render_template('admin/manage_categories.html', categories=categories)
     
@@ -359,38 +481,32 @@ def manage_categories():
         
         db.session.add(category)
         db.session.commit()
+        cache.invalidate_categories()
         
         return jsonify({
             'message': 'Category created successfully',
             'category': category.to_dict()
         }), 201
 
-@admin_bp.route('/categories/<category_id>', methods=['PUT', 'DELETE'])
+@admin_bp.route('/categories/<uuid_str:category_id>', methods=['PUT', 'DELETE'])
 @admin_required
 def manage_category(category_id):
-    category = ServiceCategory.query.get_or_404(category_id)
-    
     if request.method == 'PUT':
         data = request.get_json()
         
-        if 'name' in data:
-            category.name = data['name']
-        
-        if 'description' in data:
-            category.description = data['description']
-        
-        if 'icon' in data:
-            category.icon = data['icon']
-        
-        if 'is_active' in data:
-            category.is_active = data['is_active']
+        if not update_columns(ServiceCategory, category_id, data, ('name', 'description', 'icon', 'is_active')):
+            abort(404)
         
         db.session.commit()
+        cache.invalidate_categories()
         return jsonify({'message': 'Category updated successfully'})
     
-    elif request.method == 'DELETE':
+    category = ServiceCategory.query.get_or_404(category_id)
+    
+    if request.method == 'DELETE':
         db.session.delete(category)
         db.session.commit()
+        cache.invalidate_categories()
         return jsonify({'message': 'Category deleted successfully'})
 
 # Notification System
@@ -398,7 +514,7 @@ def manage_category(category_id):
 @admin_required
 def get_admin_notifications():
     notifications = Notification.query.filter_by(
-        user_type='admin'
+        user_id=current_user.id
     ).order_by(Notification.created_at.desc()).limit(50).all()
     
     if request.is_json:
@@ -413,39 +529,52 @@ def generate_service_report():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    query = ServiceRequest.query
+    filters = []
     
     if start_date:
         start = datetime.strptime(start_date, '%Y-%m-%d')
-        query = query.filter(ServiceRequest.created_at >= start)
+        filters.append(ServiceRequest.created_at >= start)
     
     if end_date:
         end = datetime.strptime(end_date, '%Y-%m-%d')
-        query = query.filter(ServiceRequest.created_at <= end)
+        filters.append(ServiceRequest.created_at <= end)
+    
+    # Aggregate in the database - only one row per status/category comes back
+    total_requests, estimated, actual = db.session.query(
+        db.func.count(ServiceRequest.id),
+        db.func.coalesce(db.func.sum(ServiceRequest.price_estimate), 0),
+        db.func.coalesce(db.func.sum(ServiceRequest.actual_price), 0)
+    ).filter(*filters).one()
+    
+    by_status = db.session.query(ServiceRequest.status, db.func.count(ServiceRequest.id))\
+        .filter(*filters)\
+        .group_by(ServiceRequest.status)\
+        .all()
     
-    requests = query.all()
+    # Group on the FK and name the buckets from the cached category map - no join
+    category_counts = db.session.query(ServiceRequest.category_id, db.func.count(ServiceRequest.id))\
+        .filter(*filters)\
+        .group_by(ServiceRequest.category_id)\
+        .all()
+    names = cache.category_names()
+    by_category = {}
+    for category_id, count in category_counts:
+        name = names.get(category_id, 'Unknown')
+        by_category[name] = by_category.get(name, 0) + count
     
     # Generate report data
     report_data = {
-        'total_requests': len(requests),
-        'by_status': {},
-        'by_category': {},
+        'total_requests': total_requests,
+        'by_status': dict(by_status),
+        'by_category': by_category,
         'revenue': {
-            'estimated': sum(r.price_estimate or 0 for r in requests),
-            'actual': sum(r.actual_price or 0 for r in requests)
+            'estimated': estimated,
+            'actual': actual
         }
     }
     
-    for req in requests:
-        # Count by status
-        report_data['by_status'][req.status] = report_data['by_status'].get(req.status, 0) + 1
-        
-        # Count by category
-        category_name = req.category.name if req.category else 'Unknown'
-        report_data['by_category'][category_name] = report_data['by_category'].get(category_name, 0) + 1
-    
     if request.is_json:
-        return jsonify(report_data)
+        return ojsonify(report_data)
     else:
         return render_template('admin/reports.html', report_data=report_data)
     
@@ -489,7 +618,7 @@ def create_category():
         return render_template('admin/create_category.html')
 
 # View artisan route - FIXING THE MISSING ENDPOINT
-@admin_bp.route('/artisans/view/<artisan_id>')
+@admin_bp.route('/artisans/view/<uuid_str:artisan_id>')
 @admin_required
 def view_artisan(artisan_id):
     """View artisan details page"""
@@ -1,10 +1,18 @@
-from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, current_app
-from flask_login import login_required, current_user
+from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, current_app, Response, abort
+from flask_login import current_user
 from functools import wraps
-from models import db, User, ServiceRequest, ServiceCategory, Notification, ArtisanProfile, Withdrawal, PaymentTransaction, Review, AccountDeactivation, VerificationRequest, ArtisanKYCVerification
+from models import db, User, ServiceRequest, ServiceCategory, Notification, ArtisanProfile, Withdrawal, PaymentTransaction, Review, AccountDeactivation, VerificationRequest, ArtisanKYCVerification, AVAILABILITY_CHOICES, REQUEST_STATUS_CHOICES, generate_uuid
+from sqlalchemy.orm import joinedload, lazyload, load_only, selectinload, undefer
+import cache
+from db_utils import days_between, month_bucket, strict_loading
+from tasks import enqueue_image_delete, enqueue_notifications
+from responses import dumps, ojsonify, stream_json_list
 from forms import ArtisanKYCForm
-import json
+import orjson
+import hashlib
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 from PIL import Image
 import io
@@ -15,7 +23,7 @@ import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 
 
 artisan_bp = Blueprint('artisan_bp', __name__)
@@ -24,6 +32,10 @@ artisan_bp = Blueprint('artisan_bp', __name__)
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
 MAX_PORTFOLIO_IMAGES = 20
+PORTFOLIO_IMAGE_MAX_AGE = 31536000  # one year, in seconds
+MAX_PER_PAGE = 200
+VALID_AVAILABILITY = frozenset(AVAILABILITY_CHOICES)
+PHONE_RE = re.compile(r'^\+?[\d\s\-\(\)]{10,}$')
 
 def allowed_file(filename):
     """Check if the file extension is allowed"""
@@ -34,10 +46,7 @@ def allowed_file(filename):
 
 
 def validate_file(file):
-    """Simple file validation"""
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-    MAX_SIZE = 16 * 1024 * 1024  # 16MB
-    
+    """Simple file validation; size is capped for the whole request by MAX_CONTENT_LENGTH"""
     if not file.filename:
         return False, "No filename"
     
@@ -48,34 +57,34 @@ def validate_file(file):
     if ext not in ALLOWED_EXTENSIONS:
         return False, f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
     
-    # Check file size
-    file.seek(0, os.SEEK_END)
-    size = file.tell()
-    file.seek(0)
-    
-    if size > MAX_SIZE:
-        return False, f"File too large (max 16MB)"
-    
     return True, "Valid"
 
 
-def save_image_locally(file, artisan_id):
+def content_digest(file):
+    """SHA-256 hex digest of an upload, read in 64KB chunks; leaves the stream rewound"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.stream.read(65536), b''):
+        digest.update(chunk)
+    file.stream.seek(0)
+    return digest.hexdigest()
+
+
+def save_image_locally(file, artisan_id, digest):
     """Save image locally for development"""
     try:
         from werkzeug.utils import secure_filename
-        from datetime import datetime
         
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        unique_name = f"{artisan_id}_{timestamp}_{filename}"
+        extension = os.path.splitext(secure_filename(file.filename))[1].lower()
+        unique_name = f"{artisan_id}_{digest}{extension}"
         
         # Create directory if needed
         upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'portfolio')
         os.makedirs(upload_dir, exist_ok=True)
         
-        # Save file
+        # Save file (content-addressed, so an identical re-upload is already on disk)
         file_path = os.path.join(upload_dir, unique_name)
-        file.save(file_path)
+        if not os.path.exists(file_path):
+            file.save(file_path)
         
         # Return relative URL
         return f"/static/uploads/portfolio/{unique_name}"
@@ -85,20 +94,22 @@ def save_image_locally(file, artisan_id):
         return None
 
 
-def upload_to_cloudinary(file, artisan_id):
+def upload_to_cloudinary(file, artisan_id, digest):
     """Upload image to Cloudinary for production"""
     try:
         import cloudinary.uploader
-        from datetime import datetime
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Content-addressed public_id: re-uploading the same bytes returns the
+        # existing asset instead of transforming it again
         result = cloudinary.uploader.upload(
             file,
             folder=f"portfolio/{artisan_id}",
-            public_id=f"{artisan_id}_{timestamp}",
+            public_id=f"{artisan_id}_{digest}",
+            overwrite=False,
             transformation=[
                 {'width': 1200, 'crop': 'limit'},
-                {'quality': 'auto:good'}
+                # Progressive JPEGs render a full preview early; auto quality stays below 95
+                {'quality': 'auto:good', 'flags': 'progressive'}
             ]
         )
         return result['secure_url']
@@ -108,19 +119,31 @@ def upload_to_cloudinary(file, artisan_id):
         return None
 
 
+# Uploads are network/disk bound, so a few threads let one request push several files at once.
+# Each request gets its own pool, so one artisan's batch never queues behind another's.
+UPLOAD_WORKERS_PER_REQUEST = 4
+
+def store_portfolio_image(flask_app, file, artisan_id):
+    """Save one validated image on an upload worker thread; returns its URL or None"""
+    with flask_app.app_context():
+        digest = content_digest(file)
+        if flask_app.config.get('FLASK_ENV') == 'development':
+            return save_image_locally(file, artisan_id, digest)
+        return upload_to_cloudinary(file, artisan_id, digest)
+
 def get_portfolio_images(user):
-    """Get portfolio images from user"""
-    try:
-        if user.portfolio_images:
-            return json.loads(user.portfolio_images)
-    except:
+    """The portfolio image list of the user's artisan profile. A stored list is tracked,
+    so in-place edits are flushed; when none is stored a fresh, unattached list is returned
+    and the caller assigns it back to save"""
+    profile = user.artisan_profile
+    if profile is None or profile.portfolio_images is None:
         return []
-    return []
+    return profile.portfolio_images
 
 def save_portfolio_images(user, images):
     """Save portfolio images to user with proper error handling"""
     try:
-        user.portfolio_images = json.dumps(images)
+        user.artisan_profile.portfolio_images = images
         db.session.commit()
         return True
     except Exception as e:
@@ -133,8 +156,12 @@ def save_portfolio_images(user, images):
 # Artisan Authentication Middleware
 def artisan_required(f):
     @wraps(f)
-    @login_required
     def decorated(*args, **kwargs):
+        # Flat check instead of stacking login_required: one wrapper per view
+        if not current_user.is_authenticated:
+            if request.is_json:
+                return jsonify({'error': 'Authentication required'}), 401
+            return current_app.login_manager.unauthorized()
         if current_user.user_type != 'artisan':
             if request.is_json:
                 return jsonify({'error': 'Artisan access required'}), 403
@@ -147,7 +174,7 @@ def artisan_required(f):
 @artisan_bp.route('/register', methods=['GET', 'POST'])
 def register():
     # Get all active service categories for the form
-    service_categories = ServiceCategory.query.filter_by(is_active=True).all()
+    service_categories = cache.active_categories()
     
     if request.method == 'GET':
         return render_template('auth/artisan_register.html', 
@@ -157,7 +184,7 @@ def register():
         data = request.form if request.form else request.get_json()
         
         # Check if user already exists
-        if User.query.filter_by(email=data.get('email')).first():
+        if User.email_taken(data.get('email')):
             if request.is_json:
                 return jsonify({'error': 'Email already registered'}), 400
             else:
@@ -166,7 +193,7 @@ def register():
                                       error='Email already registered')
         
         # Check if NIN already exists
-        if User.query.filter_by(nin=data.get('nin')).first():
+        if User.nin_taken(data.get('nin')):
             if request.is_json:
                 return jsonify({'error': 'NIN already registered'}), 400
             else:
@@ -203,8 +230,24 @@ def register():
                                       categories=service_categories,
                                       error='Invalid date of birth')
         
-        # 1. Create new User (base user)
+        # Artisans are matched to requests by category_id, so the category must exist
+        category_id = ServiceCategory.id_for_name(data.get('category'))
+        if category_id is None:
+            if request.is_json:
+                return jsonify({'error': 'Invalid service category'}), 400
+            else:
+                return render_template('auth/artisan_register.html', 
+                                      categories=service_categories,
+                                      error='Invalid service category')
+        
+        # Read before any row is added: this SELECT would otherwise autoflush them
+        admin_ids = User.admin_ids()
+        
+        # 1. Create new User (base user). Ids are assigned up front so the profile and
+        # KYC rows can reference them without an intermediate flush; nothing reaches
+        # the database until the guarded block below
         user = User(
+            id=generate_uuid(),
             email=data['email'],
             phone=data['phone'],
             full_name=data['full_name'],
@@ -216,12 +259,13 @@ def register():
         user.set_password(data['password'])
         
         db.session.add(user)
-        db.session.flush()  # Get user ID without committing
         
         # 2. Create ArtisanProfile with artisan-specific fields including KYC
         artisan_profile = ArtisanProfile(
+            id=generate_uuid(),
             user_id=user.id,
             category=data['category'],
+            category_id=category_id,
             skills=data.get('skills', ''),
             experience_years=int(data.get('experience_years', 0)),
             availability='available',
@@ -245,7 +289,7 @@ def register():
         # Handle credentials (JSON array)
         if data.get('credentials'):
             credentials_list = [c.strip() for c in data['credentials'].split(',') if c.strip()]
-            artisan_profile.credentials = json.dumps(credentials_list)
+            artisan_profile.credentials = credentials_list
         
         # Handle portfolio images
         portfolio_images = []
@@ -253,7 +297,7 @@ def register():
             uploaded_files = request.files.getlist('portfolio_images')
             for file in uploaded_files:
                 if file and file.filename:
-                    filename = secure_filename(file.filename)
+                    filename = f"{uuid.uuid4().hex}_{secure_filename(file.filename)}"
                     file_path = os.path.join(
                         current_app.config['UPLOAD_FOLDER'], 
                         'portfolio', 
@@ -263,28 +307,25 @@ def register():
                     portfolio_images.append(f'portfolio/{filename}')
         
         if portfolio_images:
-            artisan_profile.portfolio_images = json.dumps(portfolio_images)
+            artisan_profile.portfolio_images = portfolio_images
         
         db.session.add(artisan_profile)
         
-        # Create notification for admin about new artisan with KYC pending
-        notification = Notification(
-            user_id='admin',  # You need to get actual admin user ID
-            title='New Artisan Registration with KYC Pending',
-            message=f'New artisan registered: {user.full_name} ({artisan_profile.category}). NIN: {data["nin"]}. KYC verification required.',
-            notification_type='new_artisan_kyc_pending',
-            related_id=user.id
-        )
-        db.session.add(notification)
-        
-        # Create welcome notification for artisan
-        artisan_notification = Notification(
-            user_id=user.id,
-            title='Registration Successful',
-            message='Your registration is pending admin verification. Please complete KYC verification in your profile.',
-            notification_type='registration_pending'
-        )
-        db.session.add(artisan_notification)
+        # Notify admins about the new artisan with KYC pending, and welcome the artisan,
+        # in one multi-row INSERT
+        notifications = [{
+            'user_id': admin_id,
+            'title': 'New Artisan Registration with KYC Pending',
+            'message': f'New artisan registered: {user.full_name} ({artisan_profile.category}). NIN: {data["nin"]}. KYC verification required.',
+            'notification_type': 'new_artisan_kyc_pending',
+            'related_id': user.id
+        } for admin_id in admin_ids]
+        notifications.append({
+            'user_id': user.id,
+            'title': 'Registration Successful',
+            'message': 'Your registration is pending admin verification. Please complete KYC verification in your profile.',
+            'notification_type': 'registration_pending'
+        })
         
         # Create KYC verification request record
         kyc_verification = ArtisanKYCVerification(
@@ -297,11 +338,28 @@ def register():
             bank_name=data.get('other_bank_name') if data.get('bank_name') == 'other' else data.get('bank_name'),
             account_name=data.get('account_name', ''),
             account_number=data.get('account_number', ''),
+            # Documents are uploaded later from the KYC page
+            nin_front_image='',
+            passport_photo='',
+            proof_of_address='',
             status='pending'
         )
         db.session.add(kyc_verification)
         
-        db.session.commit()
+        # User, profile, KYC record and notifications land in one transaction. The
+        # notification INSERT autoflushes the rows above, so a concurrent duplicate
+        # email or NIN surfaces here and is rolled back
+        try:
+            Notification.bulk_create(notifications)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Artisan registration failed: {str(e)}")
+            if request.is_json:
+                return jsonify({'error': 'Registration failed'}), 500
+            return render_template('auth/artisan_register.html',
+                                  categories=service_categories,
+                                  error='Registration failed, please try again')
         
         if request.is_json:
             return jsonify({
@@ -313,78 +371,66 @@ def register():
             return render_template('auth/registration_success.html',
                                   message='Registration submitted for verification. KYC verification is pending.')
          
+def artisan_dashboard_stats(artisan_id):
+    """Dashboard job counters and earnings for one artisan in a single aggregate query"""
+    status = ServiceRequest.status
+    completed = status == 'completed'
+    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    row = db.session.query(
+        db.func.count(db.case((status == 'assigned', 1))),
+        db.func.count(db.case((status == 'in_progress', 1))),
+        db.func.count(db.case((completed, 1))),
+        db.func.coalesce(db.func.sum(db.case(
+            (db.and_(completed, ServiceRequest.created_at >= thirty_days_ago), ServiceRequest.actual_price)
+        )), 0),
+        db.func.coalesce(db.func.sum(db.case((completed, ServiceRequest.actual_price))), 0)
+    ).filter(ServiceRequest.artisan_id == artisan_id).one()
+    
+    return {
+        'assigned_jobs': row[0],
+        'active_jobs': row[1],
+        'completed_jobs': row[2],
+        'monthly_earnings': row[3],  # last 30 days
+        'total_earnings': row[4]
+    }
+
+def cached_dashboard_stats(artisan_id):
+    key = cache.artisan_dashboard_key(artisan_id)
+    stats = cache.get_json(key)
+    if stats is None:
+        stats = artisan_dashboard_stats(artisan_id)
+        cache.set_json(key, stats, cache.ARTISAN_DASHBOARD_TTL)
+    return stats
+
 @artisan_bp.route('/dashboard')
 @artisan_required
 def artisan_dashboard():
-    # Get statistics
-    assigned_jobs = ServiceRequest.query.filter_by(
-        artisan_id=current_user.id,
-        status='assigned'
-    ).count()
-    
-    active_jobs = ServiceRequest.query.filter_by(
-        artisan_id=current_user.id,
-        status='in_progress'
-    ).count()
-    
-    completed_jobs = ServiceRequest.query.filter_by(
-        artisan_id=current_user.id,
-        status='completed'
-    ).count()
-    
-    # Calculate earnings (last 30 days)
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    monthly_earnings = ServiceRequest.query.filter(
-        ServiceRequest.artisan_id == current_user.id,
-        ServiceRequest.status == 'completed',
-        ServiceRequest.created_at >= thirty_days_ago
-    ).with_entities(db.func.sum(ServiceRequest.actual_price)).scalar() or 0
-    
-    # Total earnings
-    total_earnings = ServiceRequest.query.filter(
-        ServiceRequest.artisan_id == current_user.id,
-        ServiceRequest.status == 'completed'
-    ).with_entities(db.func.sum(ServiceRequest.actual_price)).scalar() or 0
+    stats = cached_dashboard_stats(current_user.id)
     
     # Recent jobs
     recent_jobs = ServiceRequest.query.filter_by(artisan_id=current_user.id)\
+        .options(selectinload(ServiceRequest.client),
+                 selectinload(ServiceRequest.assigned_artisan),
+                 selectinload(ServiceRequest.category_obj),
+                 *strict_loading())\
         .order_by(ServiceRequest.created_at.desc())\
         .limit(5)\
         .all()
     
     # Notifications
-    notifications = Notification.query.filter_by(
-        user_id=current_user.id
-    ).order_by(Notification.created_at.desc())\
-     .limit(5)\
-     .all()
+    notifications = Notification.for_user(current_user.id, limit=5)
     
-    unread_count = Notification.query.filter_by(
-        user_id=current_user.id,
-        is_read=False
-    ).count()
+    unread_count = Notification.unread_count(current_user.id)
     
     if request.is_json:
         return jsonify({
-            'stats': {
-                'assigned_jobs': assigned_jobs,
-                'active_jobs': active_jobs,
-                'completed_jobs': completed_jobs,
-                'monthly_earnings': monthly_earnings,
-                'total_earnings': total_earnings
-            },
+            'stats': stats,
             'recent_jobs': [job.to_dict() for job in recent_jobs],
             'unread_notifications': unread_count
         })
     else:
         return render_template('artisan/dashboard.html',
-                              stats={
-                                  'assigned_jobs': assigned_jobs,
-                                  'active_jobs': active_jobs,
-                                  'completed_jobs': completed_jobs,
-                                  'monthly_earnings': monthly_earnings,
-                                  'total_earnings': total_earnings
-                              },
+                              stats=stats,
                               recent_jobs=recent_jobs,
                               notifications=notifications,
                               unread_notifications=unread_count)
@@ -434,7 +480,7 @@ def kyc_verification():
             for field_name in document_fields:
                 file = getattr(form, field_name).data
                 if file and hasattr(file, 'filename') and file.filename:
-                    filename = secure_filename(f"{current_user.id}_{field_name}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{file.filename}")
+                    filename = secure_filename(f"{current_user.id}_{field_name}_{uuid.uuid4().hex}_{file.filename}")
                     file_path = os.path.join(
                         current_app.config['UPLOAD_FOLDER'],
                         'kyc_documents',
@@ -469,7 +515,7 @@ def kyc_verification():
                 if key not in ['nin_front_image', 'nin_back_image', 'passport_photo', 'proof_of_address']:
                     other_docs.append(value)
             if other_docs:
-                artisan_profile.other_verification_docs = json.dumps(other_docs)
+                artisan_profile.other_verification_docs = orjson.dumps(other_docs).decode()
             
             # Update KYC status
             artisan_profile.kyc_status = 'submitted'
@@ -490,31 +536,29 @@ def kyc_verification():
                 nin_back_image=uploaded_files.get('nin_back_image', ''),
                 passport_photo=uploaded_files.get('passport_photo', ''),
                 proof_of_address=uploaded_files.get('proof_of_address', ''),
-                other_documents=json.dumps(other_docs) if other_docs else None,
+                other_documents=orjson.dumps(other_docs).decode() if other_docs else None,
                 status='pending'
             )
             db.session.add(kyc_request)
             
-            # Create notification for admin
-            admin_notification = Notification(
-                user_id='admin',  # Replace with actual admin ID
-                title='Artisan KYC Verification Submitted',
-                message=f'Artisan {current_user.full_name} has submitted KYC verification. NIN: {form.nin.data}',
-                notification_type='kyc_submitted',
-                related_id=artisan_profile.id
-            )
-            db.session.add(admin_notification)
-            
-            # Create notification for artisan
-            artisan_notification = Notification(
-                user_id=current_user.id,
-                title='KYC Verification Submitted',
-                message='Your KYC verification has been submitted and is pending admin review.',
-                notification_type='kyc_submitted'
-            )
-            db.session.add(artisan_notification)
+            # Notify admins and the artisan in one multi-row INSERT
+            notifications = [{
+                'user_id': admin_id,
+                'title': 'Artisan KYC Verification Submitted',
+                'message': f'Artisan {current_user.full_name} has submitted KYC verification. NIN: {form.nin.data}',
+                'notification_type': 'kyc_submitted',
+                'related_id': artisan_profile.id
+            } for admin_id in User.admin_ids()]
+            notifications.append({
+                'user_id': current_user.id,
+                'title': 'KYC Verification Submitted',
+                'message': 'Your KYC verification has been submitted and is pending admin review.',
+                'notification_type': 'kyc_submitted'
+            })
+            Notification.bulk_create(notifications)
             
             db.session.commit()
+            cache.invalidate_notifications(current_user.id)
             
             flash('KYC verification submitted successfully! It will be reviewed within 24-48 hours.', 'success')
             return redirect(url_for('artisan_bp.artisan_profile'))
@@ -626,25 +670,24 @@ def update_bank_details():
             )
             db.session.add(kyc_request)
             
-            # Create notifications
-            admin_notification = Notification(
-                user_id='admin',  # Replace with actual admin ID
-                title='Artisan Bank Details Updated',
-                message=f'Artisan {current_user.full_name} updated bank details. Requires re-verification.',
-                notification_type='bank_update',
-                related_id=artisan_profile.id
-            )
-            db.session.add(admin_notification)
-            
-            artisan_notification = Notification(
-                user_id=current_user.id,
-                title='Bank Details Updated',
-                message='Your bank details have been updated and are pending re-verification.',
-                notification_type='bank_update'
-            )
-            db.session.add(artisan_notification)
+            # Notify admins and the artisan in one multi-row INSERT
+            notifications = [{
+                'user_id': admin_id,
+                'title': 'Artisan Bank Details Updated',
+                'message': f'Artisan {current_user.full_name} updated bank details. Requires re-verification.',
+                'notification_type': 'bank_update',
+                'related_id': artisan_profile.id
+            } for admin_id in User.admin_ids()]
+            notifications.append({
+                'user_id': current_user.id,
+                'title': 'Bank Details Updated',
+                'message': 'Your bank details have been updated and are pending re-verification.',
+                'notification_type': 'bank_update'
+            })
+            Notification.bulk_create(notifications)
         
         db.session.commit()
+        cache.invalidate_notifications(current_user.id)
         
         return jsonify({
             'message': 'Bank details updated successfully',
@@ -659,46 +702,6 @@ def update_bank_details():
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Failed to update bank details: {str(e)}'}), 500
-                
-# Add these helper functions if not already defined
-def calculate_response_rate(artisan_id):
-    """Calculate artisan's response rate to job requests"""
-    # Get all jobs assigned to artisan in last 30 days
-    recent_jobs = ServiceRequest.query.filter(
-        ServiceRequest.artisan_id == artisan_id,
-        ServiceRequest.created_at >= datetime.now(timezone.utc) - timedelta(days=30)
-    ).all()
-    
-    if not recent_jobs:
-        return 0
-    
-    # Count jobs where artisan responded within 24 hours
-    responded_jobs = 0
-    for job in recent_jobs:
-        # Check if there's a response record or status change within 24 hours
-        # This is simplified - you might have a better metric
-        if job.updated_at and job.created_at:
-            response_time = job.updated_at - job.created_at
-            if response_time <= timedelta(hours=24):
-                responded_jobs += 1
-    
-    return round((responded_jobs / len(recent_jobs)) * 100, 1)
-
-def calculate_completion_rate(artisan_id):
-    """Calculate artisan's job completion rate"""
-    total_assigned = ServiceRequest.query.filter_by(
-        artisan_id=artisan_id
-    ).count()
-    
-    total_completed = ServiceRequest.query.filter_by(
-        artisan_id=artisan_id,
-        status='completed'
-    ).count()
-    
-    if total_assigned == 0:
-        return 0
-    
-    return round((total_completed / total_assigned) * 100, 1)
 
 @artisan_bp.route('/profile', methods=['GET', 'PUT', 'POST'])
 @artisan_required
@@ -727,33 +730,11 @@ def artisan_profile():
         profile_completion = int((completed_fields / total_fields) * 100)
         
         # Get categories for dropdown
-        categories = ServiceCategory.query.filter_by(is_active=True).all()
+        categories = cache.active_categories()
         
         # Get statistics for profile page
-        stats = {
-            'completed_jobs': ServiceRequest.query.filter_by(
-                artisan_id=current_user.id,
-                status='completed'
-            ).count(),
-            'total_earnings': float(db.session.query(
-                db.func.coalesce(db.func.sum(ServiceRequest.actual_price), 0)
-            ).filter(
-                ServiceRequest.artisan_id == current_user.id,
-                ServiceRequest.status == 'completed',
-                ServiceRequest.actual_price.isnot(None)
-            ).scalar()),
-            'active_jobs': ServiceRequest.query.filter_by(
-                artisan_id=current_user.id,
-                status='in_progress'
-            ).count(),
-            'pending_jobs': ServiceRequest.query.filter_by(
-                artisan_id=current_user.id,
-                status='assigned'
-            ).count(),
-            'average_rating': float(artisan_profile.rating) if artisan_profile.rating else 0.0,
-            'response_rate': calculate_response_rate(current_user.id),
-            'completion_rate': calculate_completion_rate(current_user.id),
-        }
+        stats = profile_job_stats(current_user.id)
+        stats['average_rating'] = float(artisan_profile.rating) if artisan_profile.rating else 0.0
         
         if request.is_json:
             artisan_data = current_user.to_dict()
@@ -765,8 +746,8 @@ def artisan_profile():
                 'availability': artisan_profile.availability,
                 'hourly_rate': artisan_profile.hourly_rate,
                 'min_service_fee': artisan_profile.min_service_fee,
-                'credentials': json.loads(artisan_profile.credentials) if artisan_profile.credentials else [],
-                'portfolio_images': json.loads(artisan_profile.portfolio_images) if artisan_profile.portfolio_images else [],
+                'credentials': artisan_profile.credentials or [],
+                'portfolio_images': artisan_profile.portfolio_images or [],
                 'rating': artisan_profile.rating,
                 'total_jobs': artisan_profile.total_jobs,
                 'completed_jobs': artisan_profile.completed_jobs,
@@ -775,12 +756,11 @@ def artisan_profile():
                 'artisan': artisan_data,
                 'profile_completion': profile_completion,
                 'stats': stats,
-                'categories': [cat.to_dict() for cat in categories]
+                'categories': categories
             })
         else:
-            # Parse portfolio images and credentials for template
-            portfolio_images = json.loads(artisan_profile.portfolio_images) if artisan_profile.portfolio_images else []
-            credentials = json.loads(artisan_profile.credentials) if artisan_profile.credentials else []
+            portfolio_images = artisan_profile.portfolio_images or []
+            credentials = artisan_profile.credentials or []
             
             return render_template('artisan/profile.html',
                                   artisan=current_user,
@@ -801,27 +781,27 @@ def artisan_profile():
         
         artisan_profile = current_user.artisan_profile
         
+        # Validated values are collected per table and written with one UPDATE each
+        user_values = {}
+        profile_values = {}
+        
         try:
             # Update user fields
             if 'full_name' in data:
                 if not data['full_name'].strip():
                     return jsonify({'error': 'Full name cannot be empty'}), 400
-                current_user.full_name = data['full_name'].strip()
+                user_values['full_name'] = data['full_name'].strip()
             
             if 'phone' in data:
-                if not re.match(r'^\+?[\d\s\-\(\)]{10,}$', str(data['phone'])):
+                if not PHONE_RE.match(str(data['phone'])):
                     return jsonify({'error': 'Invalid phone number format'}), 400
-                current_user.phone = data['phone']
+                user_values['phone'] = data['phone']
             
             if 'email' in data:
                 if data['email'] != current_user.email:
-                    existing = User.query.filter(
-                        User.email == data['email'],
-                        User.id != current_user.id
-                    ).first()
-                    if existing:
+                    if User.email_taken(data['email'], exclude_id=current_user.id):
                         return jsonify({'error': 'Email already registered'}), 400
-                    current_user.email = data['email']
+                    user_values['email'] = data['email']
             
             # Update artisan profile fields
             if 'category' in data:
@@ -832,32 +812,32 @@ def artisan_profile():
                 ).first()
                 if not category:
                     return jsonify({'error': 'Invalid service category'}), 400
-                artisan_profile.category = data['category']
+                profile_values['category'] = data['category']
+                profile_values['category_id'] = category.id
             
             if 'skills' in data:
-                artisan_profile.skills = data['skills']
+                profile_values['skills'] = data['skills']
             
             if 'experience_years' in data:
                 try:
                     years = int(data['experience_years'])
                     if years < 0 or years > 50:
                         return jsonify({'error': 'Experience years must be between 0 and 50'}), 400
-                    artisan_profile.experience_years = years
+                    profile_values['experience_years'] = years
                 except (ValueError, TypeError):
                     return jsonify({'error': 'Invalid experience years'}), 400
             
             if 'availability' in data:
-                valid_availabilities = ['available', 'busy', 'offline']
-                if data['availability'] not in valid_availabilities:
+                if data['availability'] not in VALID_AVAILABILITY:
                     return jsonify({'error': 'Invalid availability status'}), 400
-                artisan_profile.availability = data['availability']
+                profile_values['availability'] = data['availability']
             
             if 'hourly_rate' in data:
                 try:
                     rate = float(data['hourly_rate'])
                     if rate < 0:
                         return jsonify({'error': 'Hourly rate cannot be negative'}), 400
-                    artisan_profile.hourly_rate = rate
+                    profile_values['hourly_rate'] = rate
                 except (ValueError, TypeError):
                     return jsonify({'error': 'Invalid hourly rate'}), 400
             
@@ -866,7 +846,7 @@ def artisan_profile():
                     fee = float(data['min_service_fee'])
                     if fee < 0:
                         return jsonify({'error': 'Minimum service fee cannot be negative'}), 400
-                    artisan_profile.min_service_fee = fee
+                    profile_values['min_service_fee'] = fee
                 except (ValueError, TypeError):
                     return jsonify({'error': 'Invalid minimum service fee'}), 400
             
@@ -878,11 +858,11 @@ def artisan_profile():
                     for cred in data['credentials']:
                         if isinstance(cred, str) and cred.strip():
                             valid_credentials.append(cred.strip())
-                    artisan_profile.credentials = json.dumps(valid_credentials)
+                    profile_values['credentials'] = valid_credentials
                 elif isinstance(data['credentials'], str):
                     # Handle comma-separated string
                     creds = [c.strip() for c in data['credentials'].split(',') if c.strip()]
-                    artisan_profile.credentials = json.dumps(creds)
+                    profile_values['credentials'] = creds
                 else:
                     return jsonify({'error': 'Invalid credentials format'}), 400
             
@@ -894,13 +874,20 @@ def artisan_profile():
                     for img in data['portfolio_images'][:20]:
                         if isinstance(img, str) and img.strip():
                             valid_images.append(img.strip())
-                    artisan_profile.portfolio_images = json.dumps(valid_images)
+                    profile_values['portfolio_images'] = valid_images
                 else:
                     return jsonify({'error': 'Invalid portfolio images format'}), 400
             
-            # Update timestamps
-            current_user.updated_at = datetime.now(timezone.utc)
-            
+            user_values['updated_at'] = datetime.now(timezone.utc)
+            db.session.execute(
+                db.update(User).where(User.id == current_user.id).values(**user_values)
+            )
+            if profile_values:
+                db.session.execute(
+                    db.update(ArtisanProfile)
+                    .where(ArtisanProfile.id == artisan_profile.id)
+                    .values(**profile_values)
+                )
             db.session.commit()
             
             # Return updated data
@@ -912,8 +899,8 @@ def artisan_profile():
                 'availability': artisan_profile.availability,
                 'hourly_rate': artisan_profile.hourly_rate,
                 'min_service_fee': artisan_profile.min_service_fee,
-                'credentials': json.loads(artisan_profile.credentials) if artisan_profile.credentials else [],
-                'portfolio_images': json.loads(artisan_profile.portfolio_images) if artisan_profile.portfolio_images else [],
+                'credentials': artisan_profile.credentials or [],
+                'portfolio_images': artisan_profile.portfolio_images or [],
             })
             
             return jsonify({
@@ -967,19 +954,16 @@ def artisan_profile():
             )
             db.session.add(deactivation)
             
-            # Deactivate account
+            # Deactivate account and notify in the same transaction
             current_user.is_active = False
+            Notification.bulk_create([{
+                'user_id': current_user.id,
+                'title': 'Account Deactivated',
+                'message': 'Your artisan account has been deactivated.',
+                'notification_type': 'account_deactivated'
+            }])
             db.session.commit()
-            
-            # Create notification
-            notification = Notification(
-                user_id=current_user.id,
-                title='Account Deactivated',
-                message='Your artisan account has been deactivated.',
-                notification_type='account_deactivated'
-            )
-            db.session.add(notification)
-            db.session.commit()
+            cache.invalidate_notifications(current_user.id)
             
             return jsonify({'message': 'Account deactivated successfully'})
         
@@ -1005,29 +989,25 @@ def artisan_profile():
                 'category': current_user.artisan_profile.category if current_user.artisan_profile else 'Unknown',
                 'experience_years': current_user.artisan_profile.experience_years if current_user.artisan_profile else 0,
                 'skills': current_user.artisan_profile.skills if current_user.artisan_profile else '',
-                'credentials': json.loads(current_user.artisan_profile.credentials) if current_user.artisan_profile and current_user.artisan_profile.credentials else [],
-                'portfolio_images': json.loads(current_user.artisan_profile.portfolio_images) if current_user.artisan_profile and current_user.artisan_profile.portfolio_images else []
+                'credentials': (current_user.artisan_profile.credentials or []) if current_user.artisan_profile else [],
+                'portfolio_images': (current_user.artisan_profile.portfolio_images or []) if current_user.artisan_profile else []
             }
             
             verification_request = VerificationRequest(
                 user_id=current_user.id,
                 status='pending',
-                request_data=json.dumps(verification_data)
+                request_data=verification_data
             )
             db.session.add(verification_request)
             
-            # Create notification for admin (you need to get actual admin ID)
-            # For now, find the first admin user
-            admin = User.query.filter_by(user_type='admin', is_active=True).first()
-            if admin:
-                notification = Notification(
-                    user_id=admin.id,
-                    title='Artisan Verification Request',
-                    message=f'Artisan {current_user.full_name} has requested account verification',
-                    notification_type='verification_request',
-                    related_id=current_user.id
-                )
-                db.session.add(notification)
+            # Notify every admin in one INSERT, committed with the request
+            Notification.bulk_create([{
+                'user_id': admin_id,
+                'title': 'Artisan Verification Request',
+                'message': f'Artisan {current_user.full_name} has requested account verification',
+                'notification_type': 'verification_request',
+                'related_id': str(current_user.id)
+            } for admin_id in User.admin_ids()])
             
             db.session.commit()
             
@@ -1048,7 +1028,7 @@ def artisan_profile():
                 return jsonify({'error': 'Invalid file type. Allowed: PNG, JPG, JPEG, GIF, WEBP'}), 400
             
             # Save file
-            filename = secure_filename(file.filename)
+            filename = f"{current_user.id}_{uuid.uuid4().hex}_{secure_filename(file.filename)}"
             file_path = os.path.join(
                 current_app.config['UPLOAD_FOLDER'],
                 'portfolio',
@@ -1059,16 +1039,11 @@ def artisan_profile():
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             file.save(file_path)
             
-            # Update portfolio images
-            portfolio_images = []
-            if current_user.artisan_profile and current_user.artisan_profile.portfolio_images:
-                portfolio_images = json.loads(current_user.artisan_profile.portfolio_images)
+            # Add new image first (limit to 20)
+            portfolio_images = [f'portfolio/{filename}'] + get_portfolio_images(current_user)[:19]
+            if current_user.artisan_profile:
+                current_user.artisan_profile.portfolio_images = portfolio_images
             
-            # Add new image (limit to 20)
-            portfolio_images.insert(0, f'portfolio/{filename}')
-            portfolio_images = portfolio_images[:20]
-            
-            current_user.artisan_profile.portfolio_images = json.dumps(portfolio_images)
             current_user.updated_at = datetime.now(timezone.utc)
             db.session.commit()
             
@@ -1081,42 +1056,34 @@ def artisan_profile():
         return jsonify({'error': 'Invalid action'}), 400
 
 # Helper functions for profile statistics
-def calculate_response_rate(artisan_id):
-    """Calculate response rate to job assignments"""
-    assigned_jobs = ServiceRequest.query.filter_by(
-        artisan_id=artisan_id,
-        status='assigned'
-    ).count()
-    
-    accepted_jobs = ServiceRequest.query.filter(
-        ServiceRequest.artisan_id == artisan_id,
-        ServiceRequest.status.in_(['in_progress', 'completed'])
-    ).count()
-    
-    if assigned_jobs == 0:
-        return 100  # No assigned jobs means perfect response rate
-    
-    response_rate = (accepted_jobs / assigned_jobs) * 100
-    return round(response_rate, 1)
-
+def profile_job_stats(artisan_id):
+    """Job counters, earnings and rates for the profile page from one aggregate query.
 
-def calculate_completion_rate(artisan_id):
-    """Calculate job completion rate"""
-    accepted_jobs = ServiceRequest.query.filter(
-        ServiceRequest.artisan_id == artisan_id,
-        ServiceRequest.status.in_(['in_progress', 'completed', 'cancelled'])
-    ).count()
-    
-    completed_jobs = ServiceRequest.query.filter_by(
-        artisan_id=artisan_id,
-        status='completed'
-    ).count()
-    
-    if accepted_jobs == 0:
-        return 100  # No accepted jobs means perfect completion rate
-    
-    completion_rate = (completed_jobs / accepted_jobs) * 100
-    return round(completion_rate, 1)
+    Response rate: accepted (in progress or completed) jobs per job still awaiting
+    acceptance. Completion rate: completed jobs per job the artisan took on
+    (in progress, completed or cancelled). Either is 100 when its base is zero.
+    """
+    status = ServiceRequest.status
+    completed = status == 'completed'
+    row = db.session.query(
+        db.func.count(db.case((status == 'assigned', 1))),
+        db.func.count(db.case((status == 'in_progress', 1))),
+        db.func.count(db.case((completed, 1))),
+        db.func.count(db.case((status == 'cancelled', 1))),
+        db.func.coalesce(db.func.sum(db.case((completed, ServiceRequest.actual_price))), 0)
+    ).filter(ServiceRequest.artisan_id == artisan_id).one()
+    assigned, in_progress, completed_jobs, cancelled, total_earnings = row
+    accepted = in_progress + completed_jobs
+    taken_on = accepted + cancelled
+    
+    return {
+        'completed_jobs': completed_jobs,
+        'total_earnings': float(total_earnings),
+        'active_jobs': in_progress,
+        'pending_jobs': assigned,
+        'response_rate': round(accepted / assigned * 100, 1) if assigned else 100,
+        'completion_rate': round(completed_jobs / taken_on * 100, 1) if taken_on else 100
+    }
 
 @artisan_bp.route('/portfolio', methods=['GET', 'POST'])
 @artisan_required
@@ -1147,6 +1114,7 @@ def artisan_portfolio():
     if len(existing_images) + len(files) > 20:
         flash(f'You can only have 20 images total. You have {len(existing_images)} currently.', 'warning')
     
+    valid_files = []
     for file in files:
         if file and file.filename != '':
             # Validate file
@@ -1154,22 +1122,27 @@ def artisan_portfolio():
             if not is_valid:
                 errors.append(f"{file.filename}: {error_msg}")
                 continue
-            
-            try:
-                # Save image based on environment
-                if current_app.config.get('FLASK_ENV') == 'development':
-                    image_url = save_image_locally(file, current_user.id)
-                else:
-                    image_url = upload_to_cloudinary(file, current_user.id)
+            valid_files.append(file)
+    
+    # Upload concurrently; results are collected in submission order to keep the portfolio order
+    flask_app = current_app._get_current_object()
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS_PER_REQUEST,
+                            thread_name_prefix='portfolio-upload') as executor:
+        futures = [executor.submit(store_portfolio_image, flask_app, file, current_user.id)
+                   for file in valid_files]
+    for file, future in zip(valid_files, futures):
+        try:
+            image_url = future.result()
+            if image_url in existing_images or image_url in uploaded_urls:
+                errors.append(f"{file.filename}: Already in your portfolio")
+            elif image_url:
+                uploaded_urls.append(image_url)
+            else:
+                errors.append(f"{file.filename}: Failed to save")
                 
-                if image_url:
-                    uploaded_urls.append(image_url)
-                else:
-                    errors.append(f"{file.filename}: Failed to save")
-                    
-            except Exception as e:
-                errors.append(f"{file.filename}: Error")
-                print(f"Upload error: {e}")
+        except Exception as e:
+            errors.append(f"{file.filename}: Error")
+            print(f"Upload error: {e}")
     
     # Process successful uploads
     if uploaded_urls:
@@ -1183,7 +1156,7 @@ def artisan_portfolio():
         
         # Save to database
         try:
-            current_user.portfolio_images = json.dumps(all_images)
+            current_user.artisan_profile.portfolio_images = all_images
             db.session.commit()
             flash(f'Successfully uploaded {len(uploaded_urls)} image(s)', 'success')
         except Exception as e:
@@ -1214,30 +1187,16 @@ def delete_portfolio_image():
         # Get current portfolio
         portfolio_images = get_portfolio_images(current_user)
         
-        # Find and remove the image
-        image_to_remove = None
-        updated_portfolio = []
-        
-        for img in portfolio_images:
-            if img.get('public_id') == public_id:
-                image_to_remove = img
-            else:
-                updated_portfolio.append(img)
+        # Find the image
+        image_to_remove = next(
+            (img for img in portfolio_images if img.get('public_id') == public_id), None
+        )
         
         if image_to_remove:
-            try:
-                # Delete from Cloudinary
-                cloudinary.uploader.destroy(
-                    image_to_remove['public_id'],
-                    resource_type="image"
-                )
-                current_app.logger.info(f"Deleted image from Cloudinary: {public_id}")
-            except Exception as e:
-                current_app.logger.error(f"Cloudinary delete error: {str(e)}")
-                # Continue anyway - we'll remove from our DB
-            
-            # Update database
-            if save_portfolio_images(current_user, updated_portfolio):
+            # Update database first, then delete from Cloudinary (queued when a worker runs)
+            portfolio_images.remove(image_to_remove)
+            if save_portfolio_images(current_user, portfolio_images):
+                enqueue_image_delete(public_id)
                 flash('Image removed from portfolio', 'success')
             else:
                 flash('Error updating portfolio', 'danger')
@@ -1298,20 +1257,16 @@ def set_featured_image():
         portfolio_images = get_portfolio_images(current_user)
         
         # Find the image
-        image_to_feature = None
-        other_images = []
-        
-        for img in portfolio_images:
-            if img.get('public_id') == public_id:
-                image_to_feature = img
-            else:
-                other_images.append(img)
+        image_to_feature = next(
+            (img for img in portfolio_images if img.get('public_id') == public_id), None
+        )
         
         if image_to_feature:
             # Move to first position
-            new_portfolio = [image_to_feature] + other_images
+            portfolio_images.remove(image_to_feature)
+            portfolio_images.insert(0, image_to_feature)
             
-            if save_portfolio_images(current_user, new_portfolio):
+            if save_portfolio_images(current_user, portfolio_images):
                 return jsonify({'success': True})
             else:
                 return jsonify({'success': False, 'error': 'Database error'})
@@ -1326,16 +1281,55 @@ def set_featured_image():
 @artisan_bp.route('/portfolio/image/<path:filename>')
 def serve_portfolio_image(filename):
     from flask import send_from_directory
-    return send_from_directory(os.path.join(app.config['UPLOAD_FOLDER'], 'portfolio'), filename)
+    from werkzeug.security import safe_join
+    
+    # Behind nginx, hand the file to the proxy (internal location) instead of copying it here
+    accel_prefix = current_app.config.get('PORTFOLIO_ACCEL_REDIRECT')
+    if accel_prefix:
+        path = safe_join(accel_prefix, filename)
+        if path is None:
+            abort(404)
+        response = Response(mimetype=None)
+        response.headers['X-Accel-Redirect'] = path
+    else:
+        # With USE_X_SENDFILE set, Flask emits X-Sendfile for Apache/lighttpd instead.
+        # conditional answers If-None-Match / If-Modified-Since with 304 from the file's ETag and mtime.
+        response = send_from_directory(os.path.join(app.config['UPLOAD_FOLDER'], 'portfolio'), filename,
+                                       conditional=True, max_age=PORTFOLIO_IMAGE_MAX_AGE)
+    
+    # Upload names are unique, so a stored image never changes
+    response.headers['Cache-Control'] = f'public, max-age={PORTFOLIO_IMAGE_MAX_AGE}, immutable'
+    return response
 
 
 # Job Management
+def job_rows(query):
+    """Project the current artisan's job query onto the keys of ServiceRequest.to_dict()"""
+    return query.outerjoin(ServiceRequest.category_obj).with_entities(
+        ServiceRequest.id,
+        ServiceRequest.title,
+        ServiceRequest.description,
+        ServiceRequest.status,
+        ServiceRequest.payment_method,
+        ServiceRequest.payment_status,
+        ServiceRequest.price_estimate,
+        ServiceRequest.actual_price,
+        ServiceRequest.location,
+        ServiceRequest.preferred_date,
+        ServiceRequest.created_at,
+        ServiceCategory.name.label('category_name'),
+        ServiceRequest.category_id,
+        db.func.coalesce(ServiceCategory.icon, 'tools').label('category_icon'),
+        db.literal(current_user.full_name).label('artisan_name'),
+        ServiceRequest.artisan_id
+    )
+
 @artisan_bp.route('/jobs', methods=['GET'])
 @artisan_required
 def assigned_jobs():
     status = request.args.get('status')
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    per_page = min(request.args.get('per_page', 10, type=int), MAX_PER_PAGE)
     sort_by = request.args.get('sort_by', 'created_at')
     sort_order = request.args.get('sort_order', 'desc')
     
@@ -1344,6 +1338,10 @@ def assigned_jobs():
     
     # Apply status filter
     if status:
+        if status not in REQUEST_STATUS_CHOICES:
+            if request.is_json:
+                return jsonify({'error': 'Invalid status filter'}), 400
+            return render_template('error.html', message='Invalid status filter'), 400
         query = query.filter_by(status=status)
     
     # Apply sorting
@@ -1363,57 +1361,62 @@ def assigned_jobs():
         else:
             query = query.order_by(ServiceRequest.title.desc())
     
-    # Get paginated jobs
-    paginated_jobs = query.paginate(page=page, per_page=per_page, error_out=False)
-    
-    # Calculate statistics
+    if request.is_json:
+        # API clients get plain column rows in to_dict() shape - no entities to build
+        rows = job_rows(query)
+        
+        # Full export: stream every job instead of building one big list
+        if request.args.get('all') == '1':
+            return stream_json_list('jobs', rows)
+        
+        paginated_jobs = rows.paginate(page=page, per_page=per_page, error_out=False)
+    else:
+        # Job cards read the client and notes, so load them in batch
+        paginated_jobs = query.options(
+            selectinload(ServiceRequest.client),
+            selectinload(ServiceRequest.assigned_artisan),
+            selectinload(ServiceRequest.category_obj),
+            undefer(ServiceRequest.admin_notes),
+            *strict_loading()
+        ).paginate(page=page, per_page=per_page, error_out=False)
+    
+    # Calculate statistics from one GROUP BY status
+    counts = dict(
+        db.session.query(ServiceRequest.status, db.func.count(ServiceRequest.id))
+        .filter(ServiceRequest.artisan_id == current_user.id)
+        .group_by(ServiceRequest.status)
+        .all()
+    )
     stats = {
-        'assigned_jobs': ServiceRequest.query.filter_by(
-            artisan_id=current_user.id,
-            status='assigned'
-        ).count(),
-        'active_jobs': ServiceRequest.query.filter_by(
-            artisan_id=current_user.id,
-            status='in_progress'
-        ).count(),
-        'completed_jobs': ServiceRequest.query.filter_by(
-            artisan_id=current_user.id,
-            status='completed'
-        ).count(),
-        'cancelled_jobs': ServiceRequest.query.filter_by(
-            artisan_id=current_user.id,
-            status='cancelled'
-        ).count(),
-        'total_jobs': ServiceRequest.query.filter_by(
-            artisan_id=current_user.id
-        ).count(),
+        'assigned_jobs': counts.get('assigned', 0),
+        'active_jobs': counts.get('in_progress', 0),
+        'completed_jobs': counts.get('completed', 0),
+        'cancelled_jobs': counts.get('cancelled', 0),
+        'total_jobs': sum(counts.values()),
     }
     
-    # Calculate average completion time for completed jobs
-    completed_jobs = ServiceRequest.query.filter_by(
-        artisan_id=current_user.id,
-        status='completed'
-    ).all()
-    
-    avg_completion_time = None
-    if completed_jobs:
-        total_days = 0
-        for job in completed_jobs:
-            if job.created_at and job.updated_at:
-                days = (job.updated_at - job.created_at).days
-                total_days += days
-        avg_completion_time = total_days / len(completed_jobs)
-    
-    # Get jobs by category for chart
+    # Average completion time (days) for completed jobs
+    avg_completion_time = db.session.query(
+        db.func.avg(days_between(ServiceRequest.updated_at, ServiceRequest.created_at))
+    ).filter(
+        ServiceRequest.artisan_id == current_user.id,
+        ServiceRequest.status == 'completed'
+    ).scalar()
+    if avg_completion_time is not None:
+        avg_completion_time = float(avg_completion_time)
+    
+    # Get jobs by category for chart; names come from the cached category map
+    category_names = cache.category_names()
     jobs_by_category = {}
-    all_jobs = ServiceRequest.query.filter_by(artisan_id=current_user.id).all()
-    for job in all_jobs:
-        category = job.category.name if job.category else 'Uncategorized'
-        jobs_by_category[category] = jobs_by_category.get(category, 0) + 1
+    for category_id, count in db.session.query(ServiceRequest.category_id, db.func.count(ServiceRequest.id))\
+            .filter(ServiceRequest.artisan_id == current_user.id)\
+            .group_by(ServiceRequest.category_id):
+        category = category_names.get(category_id, 'Uncategorized')
+        jobs_by_category[category] = jobs_by_category.get(category, 0) + count
     
     if request.is_json:
-        return jsonify({
-            'jobs': [job.to_dict() for job in paginated_jobs.items],
+        return ojsonify({
+            'jobs': paginated_jobs.items,
             'stats': stats,
             'avg_completion_time': avg_completion_time,
             'jobs_by_category': jobs_by_category,
@@ -1436,10 +1439,14 @@ def assigned_jobs():
                               pagination=paginated_jobs,
                               page=page)
     
-@artisan_bp.route('/job/<job_id>', methods=['GET'])
+@artisan_bp.route('/job/<uuid_str:job_id>', methods=['GET'])
 @artisan_required
 def view_job(job_id):
-    job = ServiceRequest.query.get_or_404(job_id)
+    # to_dict() and the template read both parties; fetch them with the job
+    job = db.get_or_404(ServiceRequest, job_id, options=[
+        joinedload(ServiceRequest.client),
+        joinedload(ServiceRequest.assigned_artisan),
+    ])
     
     # Ensure artisan is assigned to this job
     if job.artisan_id != current_user.id:
@@ -1453,81 +1460,111 @@ def view_job(job_id):
     else:
         return render_template('artisan/view_job.html', job=job)
 
-@artisan_bp.route('/job/<job_id>/accept', methods=['PUT', 'POST'])
-@artisan_required
-def accept_job(job_id):
-    job = ServiceRequest.query.get_or_404(job_id)
-    
-    if job.artisan_id != current_user.id:
+# Artisan job state machine. Each action moves a job between two statuses, sets the
+# artisan's availability and notifies admins (and optionally the client); messages
+# are formatted with {artisan} and {title}.
+JOB_TRANSITIONS = {
+    'accept': {
+        'from': 'assigned',
+        'to': 'in_progress',
+        'availability': 'busy',
+        'error': 'Job is not in assigned status',
+        'success': 'Job accepted successfully',
+        'admin': ('Job Accepted by Artisan',
+                  'Artisan {artisan} has accepted job: {title}',
+                  'job_accepted'),
+        'client': None,
+    },
+    'complete': {
+        'from': 'in_progress',
+        'to': 'completed',
+        'availability': 'available',
+        'error': 'Job is not in progress',
+        'success': 'Job marked as completed',
+        'admin': ('Job Completed',
+                  'Job {title} has been completed by {artisan}',
+                  'job_completed'),
+        'client': ('Service Completed',
+                   'Your service request has been completed by {artisan}',
+                   'service_completed'),
+    },
+}
+
+def transition_job(job_id, from_status, to_status):
+    """Move one of the current artisan's jobs from from_status to to_status with a
+    single compare-and-swap UPDATE. Returns the job's (title, user_id), or None when
+    the job is missing, not theirs, or no longer in from_status."""
+    return db.session.execute(
+        db.update(ServiceRequest)
+        .where(ServiceRequest.id == job_id,
+               ServiceRequest.artisan_id == current_user.id,
+               ServiceRequest.status == from_status)
+        .values(status=to_status)
+        .returning(ServiceRequest.title, ServiceRequest.user_id)
+    ).first()
+
+def transition_error(job_id, message):
+    """Explain why transition_job() matched nothing - only runs on the failure path"""
+    artisan_id = db.session.scalar(db.select(ServiceRequest.artisan_id).filter_by(id=job_id))
+    if artisan_id is None:
+        abort(404)
+    if artisan_id != current_user.id:
         return jsonify({'error': 'Unauthorized'}), 403
-    
-    if job.status != 'assigned':
-        return jsonify({'error': 'Job is not in assigned status'}), 400
-    
-    job.status = 'in_progress'
-    current_user.availability = 'busy'
-    
-    # Create notification for admin
-    notification = Notification(
-        user_id='admin',
-        title='Job Accepted by Artisan',
-        message=f'Artisan {current_user.full_name} has accepted job: {job.title}',
-        notification_type='job_accepted',
-        related_id=job_id
+    return jsonify({'error': message}), 400
+
+def set_availability(status):
+    db.session.execute(
+        db.update(ArtisanProfile)
+        .where(ArtisanProfile.user_id == current_user.id)
+        .values(availability=status)
     )
-    db.session.add(notification)
+
+def run_job_transition(job_id, action):
+    """Apply JOB_TRANSITIONS[action] to a job: one conditional UPDATE for the job, one
+    for availability, a single commit, then notifications off the request path"""
+    spec = JOB_TRANSITIONS[action]
+    job = transition_job(job_id, spec['from'], spec['to'])
+    if job is None:
+        return transition_error(job_id, spec['error'])
+    
+    set_availability(spec['availability'])
     db.session.commit()
+    cache.invalidate_artisan_dashboard(current_user.id)
+    
+    fields = {'artisan': current_user.full_name, 'title': job.title}
+    recipients = [(admin_id, spec['admin']) for admin_id in User.admin_ids()]
+    if spec['client']:
+        recipients.append((job.user_id, spec['client']))
+    enqueue_notifications([{
+        'user_id': user_id,
+        'title': title,
+        'message': message.format(**fields),
+        'notification_type': notification_type,
+        'related_id': job_id
+    } for user_id, (title, message, notification_type) in recipients])
     
     if request.method == 'POST' and not request.is_json:
         return redirect(url_for('artisan_bp.view_job', job_id=job_id))
     
-    return jsonify({'message': 'Job accepted successfully'})
+    return jsonify({'message': spec['success']})
+
+@artisan_bp.route('/job/<uuid_str:job_id>/accept', methods=['PUT', 'POST'])
+@artisan_required
+def accept_job(job_id):
+    return run_job_transition(job_id, 'accept')
 
-@artisan_bp.route('/job/<job_id>/complete', methods=['PUT', 'POST'])
+@artisan_bp.route('/job/<uuid_str:job_id>/complete', methods=['PUT', 'POST'])
 @artisan_required
 def complete_job(job_id):
-    job = ServiceRequest.query.get_or_404(job_id)
-    
-    if job.artisan_id != current_user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    
-    if job.status != 'in_progress':
-        return jsonify({'error': 'Job is not in progress'}), 400
-    
-    job.status = 'completed'
-    current_user.availability = 'available'
-    
-    # Create notification for admin
-    admin_notification = Notification(
-        user_id='admin',
-        title='Job Completed',
-        message=f'Job {job.title} has been completed by {current_user.full_name}',
-        notification_type='job_completed',
-        related_id=job_id
-    )
-    
-    # Create notification for user
-    user_notification = Notification(
-        user_id=job.user_id,
-        title='Service Completed',
-        message=f'Your service request has been completed by {current_user.full_name}',
-        notification_type='service_completed',
-        related_id=job_id
-    )
-    
-    db.session.add(admin_notification)
-    db.session.add(user_notification)
-    db.session.commit()
-    
-    if request.method == 'POST' and not request.is_json:
-        return redirect(url_for('artisan_bp.view_job', job_id=job_id))
-    
-    return jsonify({'message': 'Job marked as completed'})
+    return run_job_transition(job_id, 'complete')
 
-@artisan_bp.route('/job/<job_id>/report-issue', methods=['POST'])
+@artisan_bp.route('/job/<uuid_str:job_id>/report-issue', methods=['POST'])
 @artisan_required
 def report_job_issue(job_id):
-    job = ServiceRequest.query.get_or_404(job_id)
+    # Only the columns this endpoint reads or writes
+    job = db.get_or_404(ServiceRequest, job_id, options=[load_only(
+        ServiceRequest.artisan_id, ServiceRequest.title, ServiceRequest.admin_notes
+    )])
     
     if job.artisan_id != current_user.id:
         return jsonify({'error': 'Unauthorized'}), 403
@@ -1541,17 +1578,17 @@ def report_job_issue(job_id):
     else:
         job.admin_notes = f"[Issue Reported by Artisan]: {issue_description}"
     
-    # Create notification for admin
-    notification = Notification(
-        user_id='admin',
-        title='Issue Reported on Job',
-        message=f'Artisan {current_user.full_name} reported an issue on job: {job.title}',
-        notification_type='job_issue',
-        related_id=job_id
-    )
-    db.session.add(notification)
     db.session.commit()
     
+    # Notify admins off the request path
+    enqueue_notifications([{
+        'user_id': admin_id,
+        'title': 'Issue Reported on Job',
+        'message': f'Artisan {current_user.full_name} reported an issue on job: {job.title}',
+        'notification_type': 'job_issue',
+        'related_id': job_id
+    } for admin_id in User.admin_ids()])
+    
     return jsonify({'message': 'Issue reported successfully'})
 
 # Availability Management
@@ -1560,13 +1597,12 @@ def report_job_issue(job_id):
 def update_availability():
     data = request.get_json()
     
-    valid_statuses = ['available', 'busy', 'offline']
     new_status = data.get('status')
     
-    if new_status not in valid_statuses:
+    if new_status not in VALID_AVAILABILITY:
         return jsonify({'error': 'Invalid availability status'}), 400
     
-    current_user.availability = new_status
+    set_availability(new_status)
     db.session.commit()
     
     return jsonify({
@@ -1581,7 +1617,7 @@ def earnings():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    per_page = min(request.args.get('per_page', 10, type=int), MAX_PER_PAGE)
     
     # Base query for completed jobs
     query = ServiceRequest.query.filter_by(
@@ -1589,91 +1625,69 @@ def earnings():
         status='completed'
     )
     
-    if start_date:
-        try:
-            start = datetime.strptime(start_date, '%Y-%m-%d')
-            # Convert to UTC if your database stores UTC
-            start = start.replace(tzinfo=timezone.utc)
-            query = query.filter(ServiceRequest.created_at >= start)
-        except ValueError:
-            pass
-    
-    if end_date:
-        try:
-            end = datetime.strptime(end_date, '%Y-%m-%d')
-            # Convert to UTC and set to end of day
-            end = end.replace(hour=23, minute=59, second=59, tzinfo=timezone.utc)
-            query = query.filter(ServiceRequest.created_at <= end)
-        except ValueError:
-            pass
-    
-    # Get statistics - FIXED: Use proper aggregation
-    total_completed_jobs = query.count()
-    
-    # Total earnings from completed jobs
-    total_earnings_result = db.session.query(db.func.coalesce(db.func.sum(ServiceRequest.actual_price), 0))\
-        .filter(ServiceRequest.artisan_id == current_user.id,
-                ServiceRequest.status == 'completed',
-                ServiceRequest.actual_price.isnot(None))\
-        .scalar()
-    total_earnings = float(total_earnings_result) if total_earnings_result else 0.0
-    
-    # This month's earnings
+    # ISO dates (YYYY-MM-DD) as UTC day bounds; the end date is inclusive
+    period = []
+    try:
+        if start_date:
+            start = datetime.combine(date.fromisoformat(start_date), time.min, tzinfo=timezone.utc)
+            period.append(ServiceRequest.created_at >= start)
+        if end_date:
+            end = datetime.combine(date.fromisoformat(end_date), time.min, tzinfo=timezone.utc)
+            period.append(ServiceRequest.created_at < end + timedelta(days=1))
+    except ValueError:
+        if request.is_json:
+            return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
+        return render_template('error.html', message='Dates must be in YYYY-MM-DD format'), 400
+    query = query.filter(*period)
+    
+    # Job counts and earnings in one aggregate. The totals and balances are all-time;
+    # the completed count and success rate follow the start/end date filter
+    completed = ServiceRequest.status == 'completed'
+    in_period = db.and_(db.true(), *period)
+    (total_assigned_jobs, period_assigned_jobs, total_completed_jobs,
+     total_earnings) = db.session.query(
+        db.func.count(ServiceRequest.id),
+        db.func.count(db.case((in_period, 1))),
+        db.func.count(db.case((db.and_(completed, in_period), 1))),
+        db.func.coalesce(db.func.sum(db.case((completed, ServiceRequest.actual_price))), 0)
+    ).filter(ServiceRequest.artisan_id == current_user.id).one()
+    total_earnings = float(total_earnings)
+    
+    # Earnings per month for the last six months (chart, this month, last month) in one GROUP BY
     today = datetime.now(timezone.utc)
-    first_day_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    monthly_earnings_result = db.session.query(db.func.coalesce(db.func.sum(ServiceRequest.actual_price), 0))\
-        .filter(ServiceRequest.artisan_id == current_user.id,
-                ServiceRequest.status == 'completed',
-                ServiceRequest.actual_price.isnot(None),
-                ServiceRequest.created_at >= first_day_of_month)\
-        .scalar()
-    monthly_earnings = float(monthly_earnings_result) if monthly_earnings_result else 0.0
-    
-    # Last month's earnings - FIXED: Proper date calculation
-    first_day_this_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    last_day_last_month = first_day_this_month - timedelta(days=1)
-    first_day_last_month = last_day_last_month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    last_month_earnings_result = db.session.query(db.func.coalesce(db.func.sum(ServiceRequest.actual_price), 0))\
+    months = []
+    year, month = today.year, today.month
+    for _ in range(6):
+        months.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    months.reverse()
+    
+    bucket = month_bucket(ServiceRequest.created_at)
+    earnings_by_month = dict(
+        db.session.query(bucket, db.func.sum(ServiceRequest.actual_price))
         .filter(ServiceRequest.artisan_id == current_user.id,
                 ServiceRequest.status == 'completed',
                 ServiceRequest.actual_price.isnot(None),
-                ServiceRequest.created_at >= first_day_last_month,
-                ServiceRequest.created_at <= last_day_last_month)\
-        .scalar()
-    last_month_earnings = float(last_month_earnings_result) if last_month_earnings_result else 0.0
-    
-    # Get paginated jobs
-    paginated_jobs = query.order_by(ServiceRequest.created_at.desc())\
+                ServiceRequest.created_at >= datetime.combine(months[0], time.min, tzinfo=timezone.utc))
+        .group_by(bucket)
+        .all()
+    )
+    earnings_values = [float(earnings_by_month.get(m.strftime('%Y-%m')) or 0) for m in months]
+    labels = [m.strftime('%b %Y') for m in months]
+    monthly_earnings = earnings_values[-1]
+    last_month_earnings = earnings_values[-2]
+    
+    # Get paginated jobs; only the transaction rows below read them, and they touch no
+    # relationship (the category's mapper-level selectin load is switched off too)
+    paginated_jobs = query.options(
+            load_only(ServiceRequest.id, ServiceRequest.title,
+                      ServiceRequest.actual_price, ServiceRequest.created_at),
+            lazyload(ServiceRequest.category_obj),
+            *strict_loading()
+        )\
+        .order_by(ServiceRequest.created_at.desc())\
         .paginate(page=page, per_page=per_page, error_out=False)
     
-    # Generate earnings data for chart (last 6 months) - FIXED
-    earnings_values = []
-    labels = []
-    for i in range(5, -1, -1):
-        # Calculate month start and end properly
-        month_start = (first_day_this_month - timedelta(days=30*i))
-        # Find last day of the month
-        if month_start.month == 12:
-            month_end = month_start.replace(year=month_start.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            month_end = month_start.replace(month=month_start.month + 1, day=1) - timedelta(days=1)
-        
-        # Set time to end of day
-        month_end = month_end.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        month_earnings_result = db.session.query(db.func.coalesce(db.func.sum(ServiceRequest.actual_price), 0))\
-            .filter(ServiceRequest.artisan_id == current_user.id,
-                    ServiceRequest.status == 'completed',
-                    ServiceRequest.actual_price.isnot(None),
-                    ServiceRequest.created_at >= month_start,
-                    ServiceRequest.created_at <= month_end)\
-            .scalar()
-        month_earnings = float(month_earnings_result) if month_earnings_result else 0.0
-        
-        earnings_values.append(month_earnings)
-        labels.append(month_start.strftime('%b %Y'))
-    
     # Get transaction history - FIXED: Use actual data
     transactions = []
     
@@ -1691,7 +1705,8 @@ def earnings():
             })
     
     # Get actual withdrawals from Withdrawal model
-    withdrawals = Withdrawal.query.filter_by(artisan_id=current_user.id).all()
+    withdrawals = Withdrawal.query.options(undefer(Withdrawal.account_details))\
+        .filter_by(artisan_id=current_user.id).all()
     for withdrawal in withdrawals:
         transactions.append({
             'id': withdrawal.id,
@@ -1719,31 +1734,21 @@ def earnings():
     # Sort transactions by date
     transactions.sort(key=lambda x: x['date'], reverse=True)
     
-    # Calculate average rating - FIXED: Get from reviews
-    reviews = Review.query.filter_by(reviewee_id=current_user.id).all()
-    if reviews:
-        average_rating = sum(review.rating for review in reviews) / len(reviews)
-    else:
-        average_rating = 0.0
-    
-    # Calculate success rate - FIXED
-    total_assigned_jobs = ServiceRequest.query.filter_by(
-        artisan_id=current_user.id
-    ).count()
-    success_rate = (total_completed_jobs / total_assigned_jobs * 100) if total_assigned_jobs > 0 else 0.0
-    
-    # Get actual withdrawal totals
-    total_withdrawals_result = db.session.query(db.func.coalesce(db.func.sum(Withdrawal.amount), 0))\
-        .filter(Withdrawal.artisan_id == current_user.id,
-                Withdrawal.status == 'completed')\
+    # Calculate average rating in SQL rather than loading every review
+    average_rating = db.session.query(db.func.avg(Review.rating))\
+        .filter(Review.reviewee_id == current_user.id)\
         .scalar()
-    total_withdrawals = float(total_withdrawals_result) if total_withdrawals_result else 0.0
+    average_rating = float(average_rating) if average_rating is not None else 0.0
     
-    pending_withdrawals_result = db.session.query(db.func.coalesce(db.func.sum(Withdrawal.amount), 0))\
-        .filter(Withdrawal.artisan_id == current_user.id,
-                Withdrawal.status == 'pending')\
-        .scalar()
-    pending_withdrawals = float(pending_withdrawals_result) if pending_withdrawals_result else 0.0
+    success_rate = (total_completed_jobs / period_assigned_jobs * 100) if period_assigned_jobs > 0 else 0.0
+    
+    # Completed and pending withdrawal totals in one aggregate
+    total_withdrawals, pending_withdrawals = db.session.query(
+        db.func.coalesce(db.func.sum(db.case((Withdrawal.status == 'completed', Withdrawal.amount))), 0),
+        db.func.coalesce(db.func.sum(db.case((Withdrawal.status == 'pending', Withdrawal.amount))), 0)
+    ).filter(Withdrawal.artisan_id == current_user.id).one()
+    total_withdrawals = float(total_withdrawals)
+    pending_withdrawals = float(pending_withdrawals)
     
     # Calculate available balance (total earnings - completed withdrawals)
     available_balance = total_earnings - total_withdrawals
@@ -1773,7 +1778,7 @@ def earnings():
     }
     
     if request.is_json:
-        return jsonify({
+        return ojsonify({
             'stats': stats,
             'transactions': transactions[:per_page],
             'earnings_data': {
@@ -1807,7 +1812,15 @@ def earnings():
 def artisan_notifications():
     filter_type = request.args.get('filter', 'all')
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), MAX_PER_PAGE)
+    
+    # Polling clients get the cached JSON body until a notification changes
+    cache_key = cache.notifications_key(current_user.id)
+    cache_field = f'{filter_type}:{page}:{per_page}'
+    if request.is_json:
+        payload = cache.get_field(cache_key, cache_field)
+        if payload is not None:
+            return Response(payload, mimetype='application/json')
     
     # Base query
     query = Notification.query.filter_by(
@@ -1824,26 +1837,16 @@ def artisan_notifications():
     elif filter_type == 'system':
         query = query.filter(Notification.notification_type.contains('system'))
     
-    # Get counts for stats
-    total_count = Notification.query.filter_by(
-        user_id=current_user.id
-    ).count()
-    
-    unread_count = Notification.query.filter_by(
-        user_id=current_user.id,
-        is_read=False
-    ).count()
-    
-    # This month's notifications
-    today = datetime.now()
-    first_day_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    this_month_count = Notification.query.filter(
-        Notification.user_id == current_user.id,
-        Notification.created_at >= first_day_of_month
-    ).count()
+    # Total, unread and this month's counts in one aggregate
+    first_day_of_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    total_count, unread_count, this_month_count = db.session.query(
+        db.func.count(Notification.id),
+        db.func.count(db.case((Notification.is_read == False, 1))),
+        db.func.count(db.case((Notification.created_at >= first_day_of_month, 1)))
+    ).filter(Notification.user_id == current_user.id).one()
     
     # Get paginated notifications
-    paginated_notifications = query.order_by(
+    paginated_notifications = query.options(*strict_loading()).order_by(
         Notification.created_at.desc(),
         Notification.is_read.asc()
     ).paginate(page=page, per_page=per_page, error_out=False)
@@ -1863,8 +1866,8 @@ def artisan_notifications():
     }
     
     if request.is_json:
-        return jsonify({
-            'notifications': [n.to_dict() for n in paginated_notifications.items],
+        payload = dumps({
+            'notifications': paginated_notifications.items,
             'stats': {
                 'total_count': total_count,
                 'unread_count': unread_count,
@@ -1878,7 +1881,9 @@ def artisan_notifications():
                 'pages': paginated_notifications.pages,
                 'has_more': paginated_notifications.has_next
             }
-        })
+        }).decode()
+        cache.set_field(cache_key, cache_field, payload, cache.NOTIFICATIONS_TTL)
+        return Response(payload, mimetype='application/json')
     else:
         return render_template('artisan/notifications.html',
                               notifications=paginated_notifications.items,
@@ -1892,16 +1897,20 @@ def artisan_notifications():
                               has_more=paginated_notifications.has_next,
                               preferences=notification_preferences)
 
-@artisan_bp.route('/notifications/<notification_id>/read', methods=['PUT', 'POST'])
+@artisan_bp.route('/notifications/<uuid_str:notification_id>/read', methods=['PUT', 'POST'])
 @artisan_required
 def mark_artisan_notification_read(notification_id):
-    notification = Notification.query.get_or_404(notification_id)
-    
-    if notification.user_id != current_user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
+    # One UPDATE scoped to the owner; someone else's notification is simply not found
+    result = db.session.execute(
+        db.update(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == current_user.id)
+        .values(is_read=True)
+    )
+    if result.rowcount == 0:
+        abort(404)
     
-    notification.is_read = True
     db.session.commit()
+    cache.invalidate_notifications(current_user.id)
     
     if request.method == 'POST' and not request.is_json:
         return redirect(url_for('artisan_bp.artisan_notifications'))
@@ -1914,11 +1923,11 @@ def mark_artisan_notification_read(notification_id):
 def mark_all_notifications_read():
     updated = Notification.query.filter_by(
         user_id=current_user.id,
-        user_type='artisan',
         is_read=False
     ).update({'is_read': True})
     
     db.session.commit()
+    cache.invalidate_notifications(current_user.id)
     
     return jsonify({
         'success': True,
@@ -1926,16 +1935,18 @@ def mark_all_notifications_read():
     })
 
 
-@artisan_bp.route('/notifications/delete/<notification_id>', methods=['DELETE'])
+@artisan_bp.route('/notifications/delete/<uuid_str:notification_id>', methods=['DELETE'])
 @artisan_required
 def delete_notification(notification_id):
-    notification = Notification.query.get_or_404(notification_id)
-    
-    if notification.user_id != current_user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
+    result = db.session.execute(
+        db.delete(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == current_user.id)
+    )
+    if result.rowcount == 0:
+        abort(404)
     
-    db.session.delete(notification)
     db.session.commit()
+    cache.invalidate_notifications(current_user.id)
     
     return jsonify({'success': True, 'message': 'Notification deleted'})
 
@@ -1949,6 +1960,7 @@ def delete_all_read_notifications():
     ).delete()
     
     db.session.commit()
+    cache.invalidate_notifications(current_user.id)
     
     return jsonify({
         'success': True,
@@ -1981,5 +1993,11 @@ def update_notification_preferences():
 # Service Categories
 @artisan_bp.route('/categories', methods=['GET'])
 def get_service_categories():
-    categories = ServiceCategory.query.filter_by(is_active=True).all()
-    return jsonify({'categories': [cat.to_dict() for cat in categories]})
\ No newline at end of file
+    # Cached pre-encoded body; admin category changes invalidate it
+    response = Response(cache.active_categories_payload(), mimetype='application/json')
+    
+    # Clients revalidate on every use, and an unchanged list comes back as a body-less 304
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
\ No newline at end of file
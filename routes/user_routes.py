@@ -1,13 +1,15 @@
 # user_routes.py
 
-from flask import Blueprint, request, jsonify, render_template, flash, redirect, url_for, current_app
+from flask import Blueprint, request, jsonify, render_template, flash, redirect, url_for, current_app, abort
 import os
+import uuid
 from werkzeug.utils import secure_filename
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash
-from models import db, User, ServiceRequest, ServiceCategory, Notification, ArtisanProfile, ServiceRequest, Payment, ArtisanKYCVerification, VerificationRequest
+from models import db, User, ServiceRequest, ServiceCategory, Notification, ArtisanProfile, ServiceRequest, Payment, ArtisanKYCVerification, VerificationRequest, generate_uuid
 from datetime import datetime, timedelta, timezone
-import json
+import cache
+from db_utils import is_uuid
 from forms import LoginForm, UserRegistrationForm, ServiceRequestForm, BankAccountForm, ArtisanRegistrationForm, ServiceRequestForm, PaymentForm
 
 user_bp = Blueprint('user_bp', __name__)
@@ -33,11 +35,13 @@ def register():
         data = request.form if request.form else request.get_json()
         
         # Check if user already exists
-        if User.query.filter_by(email=data.get('email')).first():
+        if User.email_taken(data.get('email')):
             return jsonify({'error': 'Email already registered'}), 400
         
-        # Create new user
+        # Create new user; the id is assigned up front so the notification can
+        # reference it without a flush outside the guarded commit below
         user = User(
+            id=generate_uuid(),
             email=data['email'],
             phone=data['phone'],
             full_name=data['full_name'],
@@ -48,7 +52,6 @@ def register():
         user.set_password(data['password'])
         
         db.session.add(user)
-        db.session.commit()
         
         # Create welcome notification
         notification = Notification(
@@ -58,7 +61,14 @@ def register():
             notification_type='welcome'
         )
         db.session.add(notification)
-        db.session.commit()
+        
+        # User and welcome notification land in one transaction
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Registration failed: {str(e)}")
+            return jsonify({'error': 'Registration failed'}), 500
         
         if request.is_json:
             return jsonify({
@@ -85,14 +95,8 @@ def login():
     form = LoginForm()
     
     if form.validate_on_submit():
-        # Try to find user
-        user = User.query.filter_by(email=form.email.data).first()
-        if not user:
-            # Try artisan
-            user = User.query.filter_by(email=form.email.data, user_type='artisan').first()
-            if not user:
-                # Try admin
-                user = User.query.filter_by(email=form.email.data, user_type='admin').first()
+        # One users table covers customers, artisans and admins
+        user = User.by_email(form.email.data)
         
         if user and user.check_password(form.password.data):
             if not getattr(user, 'is_active', True):
@@ -153,6 +157,16 @@ def upgrade_to_artisan():
     elif request.method == 'POST':
         data = request.form if request.form else request.get_json()
         
+        # Artisans are matched to requests by category_id, so the category must exist
+        category_id = ServiceCategory.id_for_name(data.get('category'))
+        if category_id is None:
+            if request.is_json:
+                return jsonify({'error': 'Invalid service category'}), 400
+            flash('Invalid service category', 'danger')
+            return render_template('auth/upgrade_to_artisan.html',
+                                  categories=service_categories,
+                                  user=user), 400
+        
         try:
             # 1. Update user type to artisan
             user.user_type = 'artisan'
@@ -162,13 +176,16 @@ def upgrade_to_artisan():
             if data.get('address'):
                 user.address = data['address']
             
-            # 2. Create ArtisanProfile with KYC and bank details
+            # 2. Create ArtisanProfile with KYC and bank details (id assigned up front
+            # for the KYC record below, which is built before anything is flushed)
             artisan_profile = ArtisanProfile(
+                id=generate_uuid(),
                 user_id=user.id,
                 category=data['category'],
+                category_id=category_id,
                 skills=data.get('skills', ''),
                 experience_years=int(data.get('experience_years', 0)),
-                availability='available' if data.get('availability') else 'unavailable',
+                availability='available' if data.get('availability') else 'offline',
                 
                 # KYC Information
                 nin=data.get('nin', ''),
@@ -190,7 +207,7 @@ def upgrade_to_artisan():
             # Handle credentials
             if data.get('credentials'):
                 credentials_list = [c.strip() for c in data['credentials'].split(',') if c.strip()]
-                artisan_profile.credentials = json.dumps(credentials_list)
+                artisan_profile.credentials = credentials_list
             
             # Handle portfolio images
             portfolio_images = []
@@ -198,7 +215,7 @@ def upgrade_to_artisan():
                 uploaded_files = request.files.getlist('portfolio_images')
                 for file in uploaded_files:
                     if file and file.filename:
-                        filename = secure_filename(file.filename)
+                        filename = f"{uuid.uuid4().hex}_{secure_filename(file.filename)}"
                         # Create portfolio directory if it doesn't exist
                         portfolio_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'portfolio')
                         os.makedirs(portfolio_dir, exist_ok=True)
@@ -208,13 +225,13 @@ def upgrade_to_artisan():
                         portfolio_images.append(f'portfolio/{filename}')
             
             if portfolio_images:
-                artisan_profile.portfolio_images = json.dumps(portfolio_images)
+                artisan_profile.portfolio_images = portfolio_images
             
             # Handle KYC document uploads (if provided during upgrade)
             kyc_docs = []
             if 'nin_front_image' in request.files and request.files['nin_front_image'].filename:
                 file = request.files['nin_front_image']
-                filename = secure_filename(file.filename)
+                filename = f"{uuid.uuid4().hex}_{secure_filename(file.filename)}"
                 kyc_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'kyc')
                 os.makedirs(kyc_dir, exist_ok=True)
                 file_path = os.path.join(kyc_dir, filename)
@@ -252,24 +269,23 @@ def upgrade_to_artisan():
             
             db.session.add(kyc_verification)
             
-            # 4. Create notification for admin
-            notification = Notification(
-                user_id='admin',  # Replace with actual admin ID or find admin users
-                title='Customer Upgraded to Artisan - KYC Pending',
-                message=f'{user.full_name} ({user.email}) has upgraded to artisan in {artisan_profile.category}. KYC verification required.',
-                notification_type='artisan_upgrade_kyc',
-                related_id=user.id
-            )
-            db.session.add(notification)
+            # 4. Create notifications for admins and for the user in one batch
+            notifications = [{
+                'user_id': admin_id,
+                'title': 'Customer Upgraded to Artisan - KYC Pending',
+                'message': f'{user.full_name} ({user.email}) has upgraded to artisan in {artisan_profile.category}. KYC verification required.',
+                'notification_type': 'artisan_upgrade_kyc',
+                'related_id': user.id
+            } for admin_id in User.admin_ids()]
             
-            # 5. Create notification for user
-            user_notification = Notification(
-                user_id=user.id,
-                title='Artisan Registration Submitted',
-                message='Your artisan registration is pending admin and KYC verification. Please upload required documents when prompted.',
-                notification_type='upgrade_pending_kyc'
-            )
-            db.session.add(user_notification)
+            # 5. Notification for the user
+            notifications.append({
+                'user_id': user.id,
+                'title': 'Artisan Registration Submitted',
+                'message': 'Your artisan registration is pending admin and KYC verification. Please upload required documents when prompted.',
+                'notification_type': 'upgrade_pending_kyc'
+            })
+            Notification.bulk_create(notifications)
             
             # 6. Create verification request for admin dashboard
             verification_data = {
@@ -287,7 +303,7 @@ def upgrade_to_artisan():
             verification_request = VerificationRequest(
                 user_id=user.id,
                 status='pending',
-                request_data=json.dumps(verification_data),
+                request_data=verification_data,
                 admin_notes=f'Upgraded from customer to artisan. KYC status: {artisan_profile.kyc_status}'
             )
             db.session.add(verification_request)
@@ -344,10 +360,7 @@ def dashboard():
     categories = ServiceCategory.query.filter_by(is_active=True).all()
     
     # Get unread notifications count
-    unread_notifications = Notification.query.filter_by(
-    user_id=current_user.id,
-    is_read=False
-    ).count()
+    unread_notifications = Notification.unread_count(current_user.id)
     
     if request.is_json:
         return jsonify({
@@ -382,7 +395,7 @@ def services():
                          completed_jobs=completed_jobs)
 
 
-@user_bp.route('/request/<request_id>')
+@user_bp.route('/request/<uuid_str:request_id>')
 @login_required
 def view_request(request_id):
     """View a specific service request"""
@@ -425,6 +438,8 @@ def cancel_service_request():
     
     if not request_id:
         return jsonify({'error': 'No request ID provided'}), 400
+    if not is_uuid(request_id):
+        abort(404)
     
     service_request = ServiceRequest.query.get_or_404(request_id)
     
@@ -437,6 +452,7 @@ def cancel_service_request():
     
     service_request.status = 'cancelled'
     db.session.commit()
+    cache.invalidate_artisan_dashboard(service_request.artisan_id)
     
     return jsonify({'message': 'Request cancelled successfully'})
 
@@ -464,8 +480,10 @@ def create_service_request():
             # Get payment method from form data (it's not in the WTForm)
             payment_method = request.form.get('payment_method', 'cash')
             
-            # Create service request
+            # Create service request; the id is assigned up front for the notifications,
+            # so nothing is flushed before the guarded block below
             service_request = ServiceRequest(
+                id=generate_uuid(),
                 user_id=current_user.id,
                 category_id=form.category_id.data,
                 title=form.title.data,
@@ -483,28 +501,32 @@ def create_service_request():
                 service_request.description += f"\n\nAdditional Notes: {form.additional_notes.data}"
             
             db.session.add(service_request)
-            db.session.commit()
-            
-            # Create notifications
-            notification = Notification(
-                user_id='admin',
-                title='New Service Request',
-                message=f'New service request from {current_user.full_name}: {service_request.title}',
-                notification_type='new_request',
-                related_id=service_request.id
-            )
-            db.session.add(notification)
-            
-            user_notification = Notification(
-                user_id=current_user.id,
-                title='Service Request Submitted',
-                message=f'Your service request "{service_request.title}" has been submitted.',
-                notification_type='request_submitted',
-                related_id=service_request.id
-            )
-            db.session.add(user_notification)
             
-            db.session.commit()
+            # Request and notifications (every admin plus the requester, one batch) land in
+            # one transaction; the admin lookup autoflushes the request, so it is guarded too
+            try:
+                notifications = [{
+                    'user_id': admin_id,
+                    'title': 'New Service Request',
+                    'message': f'New service request from {current_user.full_name}: {service_request.title}',
+                    'notification_type': 'new_request',
+                    'related_id': service_request.id
+                } for admin_id in User.admin_ids()]
+                
+                notifications.append({
+                    'user_id': current_user.id,
+                    'title': 'Service Request Submitted',
+                    'message': f'Your service request "{service_request.title}" has been submitted.',
+                    'notification_type': 'request_submitted',
+                    'related_id': service_request.id
+                })
+                Notification.bulk_create(notifications)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error(f"Service request creation failed: {str(e)}")
+                flash('Could not submit your service request. Please try again.', 'danger')
+                return redirect(url_for('user_bp.create_service_request'))
             
             flash('Service request submitted successfully!', 'success')
             
@@ -526,7 +548,7 @@ def flash_form_errors(form):
         for error in errors:
             flash(f"{getattr(form, field).label.text}: {error}", 'danger')
 
-@user_bp.route('/service-request/<request_id>', methods=['GET'])
+@user_bp.route('/service-request/<uuid_str:request_id>', methods=['GET'])
 @login_required
 def get_service_request(request_id):
     service_request = ServiceRequest.query.get_or_404(request_id)
@@ -544,7 +566,7 @@ def get_service_request(request_id):
     else:
         return render_template('user/view_request.html', request=service_request)
 
-@user_bp.route('/service-request/<request_id>/status')
+@user_bp.route('/service-request/<uuid_str:request_id>/status')
 @login_required
 def get_request_status(request_id):
     service_request = ServiceRequest.query.get_or_404(request_id)
@@ -558,7 +580,7 @@ def get_request_status(request_id):
         'artisan_name': service_request.assigned_artisan.full_name if service_request.assigned_artisan else None
     })
 
-@user_bp.route('/service-request/<request_id>/feedback', methods=['POST'])
+@user_bp.route('/service-request/<uuid_str:request_id>/feedback', methods=['POST'])
 @login_required
 def submit_feedback(request_id):
     service_request = ServiceRequest.query.get_or_404(request_id)
@@ -608,23 +630,14 @@ def get_notifications():
     count_only = request.args.get('count_only', 'false').lower() == 'true'
     
     if count_only:
-        unread_count = Notification.query.filter_by(
-            user_id=current_user.id,
-            user_type='user',
-            is_read=False
-        ).count()
+        unread_count = Notification.unread_count(current_user.id)
         
         return jsonify({'unread_count': unread_count})
     
     # Get all notifications
-    notifications = Notification.query.filter_by(
-        user_id=current_user.id
-    ).order_by(Notification.created_at.desc()).all()
+    notifications = Notification.for_user(current_user.id)
 
-    unread_count = Notification.query.filter_by(
-        user_id=current_user.id,
-        is_read=False
-    ).count()
+    unread_count = Notification.unread_count(current_user.id)
     
     # This week count
     from datetime import datetime, timedelta
@@ -650,7 +663,7 @@ def get_notifications():
                              this_week_count=this_week_count,
                              important_count=important_count)
 
-@user_bp.route('/notifications/<notification_id>/read', methods=['PUT'])
+@user_bp.route('/notifications/<uuid_str:notification_id>/read', methods=['PUT'])
 @login_required
 def mark_notification_read(notification_id):
     """Mark a notification as read"""
@@ -683,7 +696,7 @@ def mark_all_notifications_read():
         'count': len(notifications)
     })
 
-@user_bp.route('/notifications/<notification_id>', methods=['DELETE'])
+@user_bp.route('/notifications/<uuid_str:notification_id>', methods=['DELETE'])
 @login_required
 def delete_notification(notification_id):
     """Delete a notification"""
@@ -703,7 +716,6 @@ def clear_read_notifications():
     """Clear all read notifications"""
     notifications = Notification.query.filter_by(
         user_id=current_user.id,
-        user_type='user',
         is_read=True
     ).all()
     
@@ -723,8 +735,7 @@ def clear_read_notifications():
 def clear_all_notifications():
     """Clear all notifications"""
     notifications = Notification.query.filter_by(
-        user_id=current_user.id,
-        user_type='user'
+        user_id=current_user.id
     ).all()
     
     count = len(notifications)
@@ -819,7 +830,7 @@ def profile():
         
         if 'email' in data and data['email'] != current_user.email:
             # Check if email is already taken
-            if User.query.filter_by(email=data['email']).first():
+            if User.email_taken(data['email'], exclude_id=current_user.id):
                 return jsonify({'error': 'Email already registered'}), 400
             current_user.email = data['email']
         
@@ -912,7 +923,7 @@ def manage_bank_details():
     
     return render_template('user/bank_details.html', form=form)
 
-@user_bp.route('/payment/<request_id>', methods=['GET', 'POST'])
+@user_bp.route('/payment/<uuid_str:request_id>', methods=['GET', 'POST'])
 @login_required
 def make_payment(request_id):
     """Make payment for a service request"""
@@ -973,7 +984,7 @@ def make_payment(request_id):
             # Handle optional receipt upload
             if form.receipt_image.data and form.receipt_image.data.filename:
                 file = form.receipt_image.data
-                filename = secure_filename(f"receipt_{request_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{file.filename}")
+                filename = secure_filename(f"receipt_{request_id}_{uuid.uuid4().hex}_{file.filename}")
                 file_path = os.path.join(
                     current_app.config['UPLOAD_FOLDER'],
                     'receipts',
@@ -991,26 +1002,26 @@ def make_payment(request_id):
                 payment.payment_status = 'completed'
                 payment.verified_at = datetime.now(timezone.utc)
             
-            # Create notification
-            notification = Notification(
-                user_id=current_user.id,
-                title=f'Payment {payment.payment_status}',
-                message=f'Payment of ₦{payment.amount:,.2f} for service request "{service_request.title}" has been {payment.payment_status}.',
-                notification_type='payment_update',
-                related_id=payment.id
-            )
-            db.session.add(notification)
+            # Assign payment.id before the notifications reference it
+            db.session.flush()
             
-            # Create admin notification for bank transfers
+            # Payer notification, plus every admin for bank transfers, as one INSERT
+            notifications = [{
+                'user_id': current_user.id,
+                'title': f'Payment {payment.payment_status}',
+                'message': f'Payment of ₦{payment.amount:,.2f} for service request "{service_request.title}" has been {payment.payment_status}.',
+                'notification_type': 'payment_update',
+                'related_id': str(payment.id)
+            }]
             if form.payment_method.data == 'bank_transfer':
-                admin_notification = Notification(
-                    user_id='admin',  # Replace with actual admin user ID
-                    title='Bank Transfer Payment Pending Verification',
-                    message=f'User {current_user.full_name} has made a bank transfer payment of ₦{payment.amount:,.2f} for request #{request_id}. Receipt: {payment.receipt_image if payment.receipt_image else "Not uploaded yet"}',
-                    notification_type='payment_verification',
-                    related_id=payment.id
-                )
-                db.session.add(admin_notification)
+                notifications.extend({
+                    'user_id': admin_id,
+                    'title': 'Bank Transfer Payment Pending Verification',
+                    'message': f'User {current_user.full_name} has made a bank transfer payment of ₦{payment.amount:,.2f} for request #{request_id}. Receipt: {payment.receipt_image if payment.receipt_image else "Not uploaded yet"}',
+                    'notification_type': 'payment_verification',
+                    'related_id': str(payment.id)
+                } for admin_id in User.admin_ids())
+            Notification.bulk_create(notifications)
             
             db.session.commit()
             
@@ -1041,7 +1052,7 @@ def make_payment(request_id):
                          request=service_request,
                          company_details=COMPANY_BANK_DETAILS)
 
-@user_bp.route('/payment/confirmation/<payment_id>')
+@user_bp.route('/payment/confirmation/<uuid_str:payment_id>')
 @login_required
 def payment_confirmation(payment_id):
     """Show payment confirmation page"""
@@ -1056,7 +1067,7 @@ def payment_confirmation(payment_id):
                          payment=payment,
                          company_details=COMPANY_BANK_DETAILS)
 
-@user_bp.route('/payment/upload-receipt/<payment_id>', methods=['POST'])
+@user_bp.route('/payment/upload-receipt/<uuid_str:payment_id>', methods=['POST'])
 @login_required
 def upload_payment_receipt(payment_id):
     """Upload payment receipt for bank transfer"""
@@ -1074,7 +1085,7 @@ def upload_payment_receipt(payment_id):
         return jsonify({'error': 'No file selected'}), 400
     
     try:
-        filename = secure_filename(f"receipt_{payment_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{file.filename}")
+        filename = secure_filename(f"receipt_{payment_id}_{uuid.uuid4().hex}_{file.filename}")
         file_path = os.path.join(
             current_app.config['UPLOAD_FOLDER'],
             'receipts',
@@ -1086,15 +1097,14 @@ def upload_payment_receipt(payment_id):
         payment.receipt_image = f'receipts/{filename}'
         payment.payment_status = 'processing'
         
-        # Update notification
-        notification = Notification(
-            user_id='admin',
-            title='Payment Receipt Uploaded',
-            message=f'Receipt uploaded for payment #{payment.receipt_number} by {current_user.full_name}',
-            notification_type='receipt_uploaded',
-            related_id=payment.id
-        )
-        db.session.add(notification)
+        # Notify every admin in one INSERT
+        Notification.bulk_create([{
+            'user_id': admin_id,
+            'title': 'Payment Receipt Uploaded',
+            'message': f'Receipt uploaded for payment #{payment.receipt_number} by {current_user.full_name}',
+            'notification_type': 'receipt_uploaded',
+            'related_id': str(payment.id)
+        } for admin_id in User.admin_ids()])
         
         db.session.commit()
         
@@ -1117,7 +1127,7 @@ def payment_history():
     
     return render_template('user/payment_history.html', payments=payments)
 
-@user_bp.route('/payment/<payment_id>')
+@user_bp.route('/payment/<uuid_str:payment_id>')
 @login_required
 def view_payment(payment_id):
     """View payment details"""
@@ -0,0 +1,83 @@
+from flask import current_app
+import cloudinary.uploader
+from models import db, Notification
+import cache
+
+try:
+    import redis
+    from rq import Queue
+except ImportError:  # Without rq, notifications are written inline
+    Queue = None
+
+_queue = None
+
+def get_queue():
+    """Lazily build the 'notifications' queue from NOTIFICATION_QUEUE_URL; None when unset.
+    Portfolio image deletes share it.
+
+    Kept separate from the cache's REDIS_URL: enqueued jobs only run if an
+    `rq worker notifications` process is consuming the queue.
+    """
+    global _queue
+    if _queue is None and Queue is not None:
+        url = current_app.config.get('NOTIFICATION_QUEUE_URL')
+        if url:
+            # RQ pickles job payloads, so this connection must not decode responses
+            _queue = Queue('notifications', connection=redis.Redis.from_url(url))
+    return _queue
+
+def _insert(rows):
+    Notification.bulk_create(rows)
+    db.session.commit()
+    cache.invalidate_notifications(*{row['user_id'] for row in rows})
+
+def create_notifications(rows):
+    """RQ job: insert notification rows (dicts of column values)"""
+    from app import app
+    with app.app_context():
+        _insert(rows)
+
+def enqueue_notifications(rows):
+    """Hand notifications to the worker; falls back to inserting them in-request.
+
+    Call after the primary state change has been committed.
+    """
+    if not rows:
+        return
+    queue = get_queue()
+    if queue is not None:
+        try:
+            queue.enqueue(create_notifications, rows)
+            return
+        except redis.RedisError:
+            current_app.logger.warning('Notification queue unavailable, writing inline')
+    _insert(rows)
+
+def _destroy_image(public_id):
+    try:
+        cloudinary.uploader.destroy(public_id, resource_type="image")
+        current_app.logger.info(f"Deleted image from Cloudinary: {public_id}")
+    except Exception as e:
+        # The image is already gone from the portfolio; an orphaned asset is harmless
+        current_app.logger.error(f"Cloudinary delete error: {str(e)}")
+
+def destroy_image(public_id):
+    """RQ job: remove a deleted portfolio image from Cloudinary"""
+    from app import app
+    with app.app_context():
+        _destroy_image(public_id)
+
+def enqueue_image_delete(public_id):
+    """Hand a Cloudinary delete to the worker; falls back to deleting in-request.
+
+    Without a queue the delete stays inside the request: a serverless instance may
+    be frozen once the response is sent, so a background thread is not guaranteed to run.
+    """
+    queue = get_queue()
+    if queue is not None:
+        try:
+            queue.enqueue(destroy_image, public_id)
+            return
+        except redis.RedisError:
+            current_app.logger.warning('Task queue unavailable, deleting image inline')
+    _destroy_image(public_id)
@@ -0,0 +1,68 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+# app.py builds the application at import time from FLASK_ENV
+os.environ['FLASK_ENV'] = 'testing'
+os.environ.pop('SERVERLESS', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app as flask_app
+from models import db, generate_uuid, User, ArtisanProfile, ServiceCategory, ServiceRequest, Notification
+
+
+@pytest.fixture
+def app():
+    # The test client talks plain http, so the session cookie must not be Secure-only
+    flask_app.config['SESSION_COOKIE_SECURE'] = False
+    return flask_app
+
+
+@pytest.fixture
+def artisan(app):
+    """A verified artisan and a customer; returns (artisan_id, customer_id, category_id)"""
+    with app.app_context():
+        category_id = ServiceCategory.id_for_name('Plumber')
+        artisan = User(id=generate_uuid(), email=f'artisan-{uuid.uuid4().hex}@example.com',
+                       phone='08012345678', full_name='Test Artisan',
+                       user_type='artisan', is_verified=True)
+        artisan.set_password('Password123!')
+        customer = User(id=generate_uuid(), email=f'customer-{uuid.uuid4().hex}@example.com',
+                        phone='08087654321', full_name='Test Customer', user_type='customer')
+        customer.set_password('Password123!')
+        profile = ArtisanProfile(user_id=artisan.id, category='Plumber', category_id=category_id)
+        db.session.add_all([artisan, customer, profile])
+        db.session.commit()
+        return artisan.id, customer.id, category_id
+
+
+@pytest.fixture
+def client(app, artisan):
+    """Test client logged in as the artisan"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = artisan[0]
+        session['_fresh'] = True
+    return client
+
+
+@pytest.fixture
+def add_jobs(app, artisan):
+    """add_jobs(n): n completed, paid jobs for the artisan, each with a job notification"""
+    artisan_id, customer_id, category_id = artisan
+
+    def add(count):
+        with app.app_context():
+            for i in range(count):
+                job = ServiceRequest(id=generate_uuid(), user_id=customer_id, artisan_id=artisan_id,
+                                     category_id=category_id, title=f'Job {i}',
+                                     description='Fix the kitchen sink', location='Lagos',
+                                     status='completed', actual_price=5000.0)
+                db.session.add(job)
+                db.session.add(Notification(user_id=artisan_id, title='Job completed',
+                                            message=job.title, notification_type='job_completed',
+                                            related_id=job.id))
+            db.session.commit()
+    return add
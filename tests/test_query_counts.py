@@ -0,0 +1,27 @@
+"""The artisan list views must issue a fixed number of statements however many rows
+they return - a count that grows with the rows is an N+1 lazy load."""
+import pytest
+
+JSON = {'Content-Type': 'application/json'}
+
+
+def query_count(client, path):
+    response = client.get(path, headers=JSON)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return int(response.headers['X-Query-Count'])
+
+
+@pytest.mark.parametrize('path', [
+    '/artisan/jobs?per_page=50',
+    '/artisan/earnings?per_page=50',
+    '/artisan/notifications?per_page=50',
+])
+def test_query_count_does_not_grow_with_rows(client, add_jobs, path):
+    add_jobs(2)
+    few = query_count(client, path)
+
+    add_jobs(10)
+    many = query_count(client, path)
+
+    assert many == few
+